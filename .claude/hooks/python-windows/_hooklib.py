@@ -0,0 +1,380 @@
+"""Shared helpers for the Claude Code hooks
+
+Only stdlib modules are imported here - hooks start a fresh interpreter on
+every tool call, and importing requests (urllib3, charset_normalizer, certifi,
+idna) used to dominate their run time.
+"""
+import http.client
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import time
+
+try:
+    import orjson
+
+    loads = orjson.loads
+    # Request bodies and queue lines want bytes - skip the str round-trip
+    dumpb = orjson.dumps
+
+    def dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    loads = json.loads
+    dumps = json.dumps
+
+    def dumpb(obj):
+        return json.dumps(obj).encode()
+
+_END = object()
+
+# Diagnostics go to stderr, and only when CLAUDE_HOOK_DEBUG=1
+DEBUG = os.environ.get('CLAUDE_HOOK_DEBUG') == '1'
+
+# Largest hook payload read from stdin - anything bigger isn't a real tool payload
+MAX_PAYLOAD = 262144
+
+API_HOST = 'localhost'
+API_PORT = 8080
+SEARCH_PATH = '/api/search'
+ADD_MEMORY_PATH = '/api/add_memory'
+
+# Fire-and-forget add_memory datagrams (memory_api_server's UDP listener) - only
+# for single writes that may be lost; the queue is always flushed over HTTP
+UDP_PORT = 8081
+# Larger payloads go over HTTP - IPv4 caps a UDP payload at 65507 bytes
+_MAX_DATAGRAM = 65000
+_udp_sock = None
+
+# memory-store appends to this JSONL queue and flushes it as one batch
+ADD_MEMORY_BATCH_PATH = '/api/add_memory_batch'
+QUEUE_PATH = os.path.join(os.path.expanduser('~'), '.claude', 'memory_queue.jsonl')
+QUEUE_FLUSH_LINES = 8
+QUEUE_MAX_AGE = 5.0
+# Stop holding on to unsent memories past this point (server down for a long time)
+QUEUE_MAX_LINES = 256
+
+# One keep-alive connection per thread (the hook daemon runs hooks concurrently)
+_local = threading.local()
+
+# The hook daemon serves every project from one process - it records the
+# working directory forwarded by hook-client.py for the request being handled
+_request_dir = threading.local()
+
+# Error classification, checked in priority order - same order and case rules
+# as shell-unix/error-recovery.sh ('no such file', null and undefined ignore case)
+_ERR_CHECKS = (
+    (re.compile(r'TypeError'), 'TypeError'),
+    (re.compile(r'SyntaxError'), 'SyntaxError'),
+    (re.compile(r'Cannot find module|Module not found'), 'ModuleNotFound'),
+    (re.compile(r'ENOENT|(?i:no such file)'), 'FileNotFound'),
+    (re.compile(r'Permission denied'), 'PermissionError'),
+    (re.compile(r'null|undefined', re.IGNORECASE), 'NullReference'),
+)
+
+FILE_TOOLS = frozenset(('Edit', 'Write', 'MultiEdit'))
+
+
+def _connection(timeout):
+    """Return this thread's connection, connected, and whether it was reused
+
+    timeout is either a number or a (connect, read) tuple. The API is on
+    localhost, so a short connect timeout fails fast when the server is down
+    without cutting off a slow search.
+    """
+    connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        conn = http.client.HTTPConnection(API_HOST, API_PORT)
+        _local.conn = conn
+
+    reused = conn.sock is not None
+    if not reused:
+        conn.timeout = connect_timeout
+        conn.connect()
+    conn.sock.settimeout(read_timeout)
+    return conn, reused
+
+
+def _drop_connection():
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+def request(method, path, obj=None, timeout=(0.05, 2.0)):
+    """Send a request to the memory API and return (status, body bytes)"""
+    body = dumpb(obj) if obj is not None else None
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+
+    for attempt in range(2):
+        reused = False
+        try:
+            conn, reused = _connection(timeout)
+            conn.request(method, path, body, headers)
+            response = conn.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, ConnectionError):
+            _drop_connection()
+            # Retry once if the server dropped an idle keep-alive connection
+            if not reused or attempt:
+                raise
+        except OSError:
+            _drop_connection()
+            raise
+
+
+def exit_silently(*_exc_info):
+    """sys.excepthook for hooks that must never fail loudly
+
+    Flushes whatever the hook already printed and exits 0 without formatting a
+    traceback (unless CLAUDE_HOOK_DEBUG=1). Only installed when a hook runs as
+    a script - under the hook daemon exceptions propagate to the daemon, which
+    swallows them.
+    """
+    try:
+        sys.stdout.flush()
+        if DEBUG:
+            import traceback
+            traceback.print_exception(*_exc_info)
+            sys.stderr.flush()
+    except Exception:
+        pass
+    os._exit(0)
+
+
+def log(msg):
+    """Debug-only diagnostics - stdout stays reserved for what Claude should see"""
+    if DEBUG:
+        sys.stderr.write(msg + '\n')
+
+
+def set_request_dir(path):
+    """Record the hook client's working directory for this thread (hook daemon only)"""
+    _request_dir.path = path
+
+
+def project_name(data=None):
+    """Name of the project the hook fired in
+
+    Uses the payload's cwd field when there is one, then the directory the
+    hook client forwarded to the daemon, then this process's own directory.
+    """
+    cwd = data.get('cwd') if isinstance(data, dict) else None
+    cwd = cwd or getattr(_request_dir, 'path', None) or os.getcwd()
+    return os.path.basename(os.path.normpath(cwd))
+
+
+def get(path, timeout=(0.05, 2.0)):
+    return request('GET', path, timeout=timeout)
+
+
+def post(path, obj, timeout=(0.05, 2.0)):
+    return request('POST', path, obj, timeout=timeout)
+
+
+def response_text(obj, cap=1000):
+    """Join the string leaves of a tool response, stopping once cap chars are collected
+
+    Bash output or file reads can make tool_response several MB; str()-ing the
+    whole structure just to keep the first 1000 chars was the hooks' main cost.
+    """
+    if isinstance(obj, str):
+        return obj[:cap]
+
+    parts = []
+    remaining = cap
+    stack = [iter((obj,))]
+    while stack and remaining > 0:
+        item = next(stack[-1], _END)
+        if item is _END:
+            stack.pop()
+        elif isinstance(item, dict):
+            stack.append(iter(item.values()))
+        elif isinstance(item, (list, tuple)):
+            stack.append(iter(item))
+        elif item is not None:
+            text = (item if isinstance(item, str) else str(item))[:remaining]
+            if text:
+                parts.append(text)
+                remaining -= len(text) + 1
+    return '\n'.join(parts)[:cap]
+
+
+def classify_error(tool_response):
+    """Map error text to a coarse error type, e.g. 'TypeError' or 'FileNotFound'"""
+    for pattern, error_type in _ERR_CHECKS:
+        if pattern.search(tool_response):
+            return error_type
+    return 'GenericError'
+
+
+def check_file_memory(tool_name, file_path):
+    """Search memory for past issues with a file and return the PreToolUse decision
+
+    Highly similar past issues turn the decision into "ask"; anything else is
+    allowed with a one-line summary.
+    """
+    response = {
+        "permissionDecision": "allow",
+        "permissionDecisionReason": "Memory check completed"
+    }
+    if not file_path or tool_name not in FILE_TOOLS:
+        return response
+
+    file_name = os.path.basename(file_path)
+    try:
+        status, body = post(
+            SEARCH_PATH,
+            {
+                'query': f'{file_name} error issue problem bug freeze',
+                'max_results': 5,
+                'similarity_threshold': 0.5,
+                'sort_by': 'similarity'
+            },
+            timeout=(0.05, 0.9)
+        )
+        if status != 200:
+            return response
+        memories = loads(body).get('data', {}).get('results', [])
+    except Exception:
+        # If memory check fails, still allow but note the error
+        response["permissionDecisionReason"] = "● Memory: offline"
+        return response
+
+    # Results arrive sorted by similarity, so stop at the first one below the bar
+    critical_issues = []
+    for m in memories:
+        if m.get('similarity', 0) <= 0.7:
+            break
+        critical_issues.append(m)
+
+    if critical_issues:
+        # Found critical issues - ask for confirmation
+        issue_titles = [issue.get('title', 'Unknown')[:30] for issue in critical_issues[:2]]
+        return {
+            "permissionDecision": "ask",
+            "permissionDecisionReason": f"⚠ Memory: {len(critical_issues)} past issues with {file_name}: {', '.join(issue_titles)}"
+        }
+
+    # No critical issues - auto-approve with context
+    if memories:
+        response["permissionDecisionReason"] = f"● Memory check: {len(memories)} related memories found"
+    else:
+        response["permissionDecisionReason"] = "● Memory check: clear"
+    return response
+
+
+def _lock_file(f):
+    f.seek(0)
+    if os.name == 'nt':
+        import msvcrt
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(f):
+    f.seek(0)
+    if os.name == 'nt':
+        import msvcrt
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def send_memory(memory_data, timeout=(0.05, 2.0)):
+    """Fire-and-forget add_memory as one UDP datagram - no connect, no reply to wait for
+
+    sendto() succeeds whether or not the server is listening, so this is only
+    for a single write that is acceptable to lose. Payloads too big for a
+    datagram fall back to a regular HTTP POST.
+    """
+    global _udp_sock
+    payload = dumpb(memory_data)
+    if len(payload) > _MAX_DATAGRAM:
+        post(ADD_MEMORY_PATH, memory_data, timeout=timeout)
+        return
+    if _udp_sock is None:
+        _udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    _udp_sock.sendto(payload, ('127.0.0.1', UDP_PORT))
+
+
+def _send_batch(items, timeout):
+    """Send queued memories as one HTTP batch - raises unless the server accepted it"""
+    status, _ = post(ADD_MEMORY_BATCH_PATH, {'items': items}, timeout=timeout)
+    if not 200 <= status < 300:
+        raise http.client.HTTPException(f'add_memory_batch failed with HTTP {status}')
+
+
+def _flush_locked(f, force, timeout):
+    f.seek(0)
+    lines = f.read().splitlines()
+    if not lines:
+        return
+    items = []
+    for line in lines:
+        try:
+            items.append(loads(line))
+        except ValueError:
+            # A torn write - skip that line, keep the rest of the queue
+            continue
+    if not items:
+        f.truncate(0)
+        return
+
+    if not force and len(items) < QUEUE_FLUSH_LINES:
+        if time.time() - items[0].get('queued_at', 0) < QUEUE_MAX_AGE:
+            return
+    try:
+        _send_batch(items, timeout)
+    except (OSError, http.client.HTTPException):
+        # Keep the memories for the next flush unless the queue has run away
+        if len(items) < QUEUE_MAX_LINES:
+            return
+    f.truncate(0)
+
+
+def queue_memory(memory_data, timeout=(0.05, 2.0)):
+    """Append a memory to the on-disk queue and flush it once it is big or old enough
+
+    Bursts of tool uses (MultiEdit over many files, rapid Bash) cost one file
+    append each, and the server sees one batch instead of N requests.
+    """
+    memory_data['queued_at'] = time.time()
+    line = dumpb(memory_data) + b'\n'
+    try:
+        f = open(QUEUE_PATH, 'a+b')
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(QUEUE_PATH), exist_ok=True)
+        f = open(QUEUE_PATH, 'a+b')
+    with f:
+        _lock_file(f)
+        try:
+            f.write(line)
+            f.flush()
+            _flush_locked(f, False, timeout)
+        finally:
+            _unlock_file(f)
+
+
+def flush_memory_queue(timeout=(0.05, 2.0)):
+    """Send whatever is left in the queue - called at session end"""
+    try:
+        f = open(QUEUE_PATH, 'r+b')
+    except FileNotFoundError:
+        return
+    with f:
+        _lock_file(f)
+        try:
+            _flush_locked(f, True, timeout)
+        finally:
+            _unlock_file(f)
+
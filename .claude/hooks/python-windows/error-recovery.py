@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Claude Code Hook - Learn from errors and suggest recovery"""
+
+import sys
+import re
+from datetime import datetime
+
+from _hooklib import MAX_PAYLOAD, SEARCH_PATH, classify_error, exit_silently, loads, post, project_name, response_text, send_memory
+
+# Cheap gate - most tool responses contain no error at all (case-sensitive, as in error-recovery.sh)
+_ERRFAIL_RE = re.compile(r'error|Error|failed')
+_FIX_RE = re.compile(r'fixed by (.+?)[\.\n]', re.IGNORECASE)
+
+def main():
+    # Read JSON payload from stdin
+    json_payload = sys.stdin.buffer.read(MAX_PAYLOAD)
+    data = loads(json_payload)
+
+    tool_name = data.get('tool_name', '')
+    tool_response = response_text(data.get('tool_response', {}), 1000)
+
+    # Check if there was an error
+    if not _ERRFAIL_RE.search(tool_response):
+        return 0
+
+    print("[ERROR] Analyzing error and searching for solutions...")
+
+    # Classify the error
+    error_type = classify_error(tool_response)
+
+    # Search for similar errors and their solutions
+    status, body = post(
+        SEARCH_PATH,
+        {
+            'query': f'{error_type} error fixed solution resolved',
+            'max_results': 3,
+            'similarity_threshold': 0.5
+        },
+        timeout=(0.05, 2.0)
+    )
+
+    solutions = []
+    if status == 200:
+        result = loads(body)
+        if result.get('success'):
+            for r in result.get('data', {}).get('results', []):
+                preview = r.get('preview', '').lower()
+                if 'fixed' in preview or 'resolved' in preview or 'solution' in preview:
+                    # Try to extract the fix
+                    fix_match = _FIX_RE.search(preview)
+                    if fix_match:
+                        solutions.append(fix_match.group(1))
+                    elif 'add' in preview:
+                        solutions.append('Check if dependencies or imports are missing')
+                    elif 'null' in preview or 'undefined' in preview:
+                        solutions.append('Add null checks or optional chaining')
+
+    if solutions:
+        print('[SOLUTION] Potential solutions from memory:')
+        for i, sol in enumerate(solutions[:3], 1):
+            print(f'  {i}. {sol}')
+        print('\n[ACTION] Try these solutions or search memory for more details.')
+    else:
+        # Store this new error for future learning - a single write, so one datagram
+        send_memory(
+            {
+                'title': f'Error: {error_type} in {tool_name}',
+                'content': f'Error Type: {error_type}\nTool: {tool_name}\nResponse: {tool_response}\nDate: {datetime.now().isoformat()}\nStatus: Unresolved - needs solution',
+                'source': 'claude_code',
+                'technologies': ['error-tracking'],
+                'complexity': 'high',
+                'project': project_name(data)
+            },
+            timeout=(0.05, 2.0)
+        )
+        print('[STORED] New error pattern stored for future learning')
+
+    return 0
+
+if __name__ == '__main__':
+    sys.excepthook = exit_silently
+    sys.exit(main())
@@ -1,23 +1,53 @@
 #!/usr/bin/env python3
 """First action check - initializes memory on first tool use and auto-approves"""
 import sys
-import json
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+from _hooklib import MAX_PAYLOAD, dumps, loads, post, project_name
+
 # Track if we've already initialized this session
-SESSION_MARKER = os.path.join(os.environ.get('TEMP', '/tmp'), f'claude_session_{os.getpid()}.marker')
+MARKER_DIR = os.environ.get('TEMP', '/tmp')
+
+# Recently initialized sessions (only survives under the hook daemon) - capped,
+# a session that falls out is still caught by its marker file
+_FIRST_ACTION_DONE = OrderedDict()
+_MAX_REMEMBERED_SESSIONS = 256
+_done_lock = threading.Lock()
+
+def is_first_action(session_key):
+    """True only the first time a session is seen - the marker is created atomically"""
+    with _done_lock:
+        if session_key in _FIRST_ACTION_DONE:
+            _FIRST_ACTION_DONE.move_to_end(session_key)
+            return False
+        _FIRST_ACTION_DONE[session_key] = None
+        if len(_FIRST_ACTION_DONE) > _MAX_REMEMBERED_SESSIONS:
+            _FIRST_ACTION_DONE.popitem(last=False)
+
+    marker = os.path.join(MARKER_DIR, f'claude_session_{session_key}.marker')
+    try:
+        with open(marker, 'x') as f:
+            f.write(str(datetime.now()))
+    except FileExistsError:
+        return False
+    except OSError:
+        pass
+    return True
 
 def main():
     try:
         # Read stdin - REQUIRED for PreToolUse hooks
-        stdin_data = sys.stdin.read()
-        data = json.loads(stdin_data)
+        stdin_data = sys.stdin.buffer.read(MAX_PAYLOAD)
+        data = loads(stdin_data)
         
         tool_name = data.get('tool_name', '')
         
         # Check if this is the first action of the session
-        first_action = not os.path.exists(SESSION_MARKER)
+        session_id = ''.join(c for c in str(data.get('session_id', '')) if c.isalnum() or c == '-')
+        first_action = is_first_action(session_id or os.getpid())
         
         # Default response - allow the operation
         response = {
@@ -26,62 +56,36 @@ def main():
         }
         
         if first_action:
-            # Mark that we've initialized
-            try:
-                with open(SESSION_MARKER, 'w') as f:
-                    f.write(str(datetime.now()))
-            except:
-                pass
-            
             # Initialize memory context
-            project_name = os.path.basename(os.getcwd())
+            project = project_name(data)
             memory_context = []
+            doc_count = 0
             
             try:
-                import requests
-                
-                # Check memory server health
-                health_response = requests.get('http://localhost:8080/api/health', timeout=1)
+                # Health, recent-memory search and session log in one round-trip
+                status, body = post(
+                    '/api/session_start',
+                    {
+                        'project': project,
+                        'query': f'{project} recent work session important',
+                        'max_results': 5
+                    },
+                    timeout=(0.05, 0.9)
+                )
                 
-                if health_response.status_code == 200:
-                    health_data = health_response.json()
-                    if health_data.get('success'):
-                        doc_count = health_data.get('data', {}).get('database', {}).get('document_count', 0)
+                if status == 200:
+                    session_data = loads(body)
+                    if session_data.get('success'):
+                        doc_count = session_data.get('data', {}).get('doc_count', 0)
                         memory_context.append(f"Memory system active: {doc_count} memories available")
                         
-                        # Search for relevant memories
-                        search_response = requests.post(
-                            'http://localhost:8080/api/search',
-                            json={
-                                'query': f'{project_name} recent work session important',
-                                'max_results': 5,
-                                'similarity_threshold': 0.4
-                            },
-                            timeout=1
-                        )
-                        
-                        if search_response.status_code == 200:
-                            search_data = search_response.json()
-                            memories = search_data.get('data', {}).get('results', [])
+                        memories = session_data.get('data', {}).get('memories', [])
+                        if memories:
+                            memory_context.append(f"Found {len(memories)} relevant memories from past sessions")
                             
-                            if memories:
-                                memory_context.append(f"Found {len(memories)} relevant memories from past sessions")
-                                
-                                # Add memory titles to context
-                                for mem in memories[:3]:
-                                    memory_context.append(f"- {mem.get('title', 'Unknown')}")
-                        
-                        # Log session start
-                        requests.post(
-                            'http://localhost:8080/api/add_memory',
-                            json={
-                                'title': f'Session: {project_name}',
-                                'content': f'New session started at {datetime.now().isoformat()} in {project_name}',
-                                'source': 'claude_code',
-                                'project': project_name
-                            },
-                            timeout=1
-                        )
+                            # Add memory titles to context
+                            for mem in memories[:3]:
+                                memory_context.append(f"- {mem.get('title', 'Unknown')}")
                         
             except Exception as e:
                 memory_context.append(f"Memory system unavailable: {str(e)[:30]}")
@@ -96,7 +100,7 @@ def main():
             response["permissionDecisionReason"] = context_msg
         
         # Output the JSON response
-        print(json.dumps(response))
+        print(dumps(response))
         
     except Exception as e:
         # On any error, allow the operation
@@ -104,7 +108,7 @@ def main():
             "permissionDecision": "allow",
             "permissionDecisionReason": f"Initialization error: {str(e)[:50]}"
         }
-        print(json.dumps(fallback))
+        print(dumps(fallback))
     
     return 0
 
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Thin hook client - forwards a hook payload to the pre-warmed hook daemon
+
+Usage: python -S hook-client.py <hook-name>
+
+Only socket/sys/os are imported so interpreter startup stays minimal. When
+hook_daemon.py is not running the hook script is executed directly instead.
+"""
+import os
+import socket
+import sys
+
+HOST = '127.0.0.1'
+PORT = int(os.environ.get('CLAUDE_HOOK_DAEMON_PORT', '8765'))
+MAX_PAYLOAD = 262144  # same cap as _hooklib.MAX_PAYLOAD
+
+
+def run_directly(hook_name):
+    """Fallback - run the hook script in a regular interpreter"""
+    import subprocess
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), f'{hook_name}.py')
+    return subprocess.call([sys.executable, script])
+
+def main():
+    if len(sys.argv) < 2:
+        return 0
+    hook_name = sys.argv[1]
+
+    try:
+        conn = socket.create_connection((HOST, PORT), timeout=0.05)
+    except OSError:
+        return run_directly(hook_name)
+
+    try:
+        with conn:
+            conn.settimeout(10)
+            # The daemon runs in its own directory - forward ours so hooks tag the right project
+            header = f'{hook_name}\n{os.getcwd()}\n'.encode('utf-8', 'surrogateescape')
+            conn.sendall(header + sys.stdin.buffer.read(MAX_PAYLOAD))
+            conn.shutdown(socket.SHUT_WR)
+
+            chunks = []
+            while True:
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        # Daemon stalled or died mid-request - hooks never fail loudly
+        return 0
+
+    header, _, output = b''.join(chunks).partition(b'\n')
+    sys.stdout.buffer.write(output)
+    sys.stdout.flush()
+    return int(header or 0)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Hook daemon - runs the Python hooks inside one long-lived, pre-warmed process
+
+Every hook normally starts a fresh interpreter and imports its dependencies
+before doing any work. The daemon imports each hook module once and serves
+hook-client.py over a loopback socket, so a hook firing only costs a socket
+round-trip.
+
+Protocol: the client sends the hook name on the first line and its working
+directory on the second, followed by the raw hook payload, then half-closes
+the socket. The daemon answers with the exit code on the first line followed by
+whatever the hook wrote to stdout. Hooks read the forwarded directory through
+_hooklib.project_name().
+"""
+import importlib.util
+import io
+import os
+import socketserver
+import sys
+import threading
+import traceback
+
+from _hooklib import MAX_PAYLOAD, set_request_dir  # also pre-warms the helpers shared by the hooks
+
+HOST = '127.0.0.1'
+PORT = int(os.environ.get('CLAUDE_HOOK_DAEMON_PORT', '8765'))
+HOOK_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_local = threading.local()
+_modules = {}
+_modules_lock = threading.Lock()
+
+
+class _ThreadStream:
+    """Stand-in for sys.stdin/sys.stdout that resolves to the current request's stream"""
+
+    def __init__(self, attr, default):
+        self._attr = attr
+        self._default = default
+
+    def __getattr__(self, name):
+        return getattr(getattr(_local, self._attr, None) or self._default, name)
+
+
+def _load_hook(hook_name):
+    """Import a hook script by name (e.g. 'memory-check'), caching the module"""
+    if not hook_name.replace('-', '').isalpha():
+        raise LookupError(f'Invalid hook name: {hook_name!r}')
+
+    with _modules_lock:
+        module = _modules.get(hook_name)
+        if module is None:
+            path = os.path.join(HOOK_DIR, f'{hook_name}.py')
+            if not os.path.isfile(path):
+                raise LookupError(f'Unknown hook: {hook_name}')
+            spec = importlib.util.spec_from_file_location(f"hook_{hook_name.replace('-', '_')}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            _modules[hook_name] = module
+        return module
+
+
+class HookHandler(socketserver.StreamRequestHandler):
+    """Runs one hook invocation with the payload as stdin and captures stdout"""
+
+    def handle(self):
+        hook_name = self.rfile.readline().decode('utf-8', 'replace').strip()
+        cwd = self.rfile.readline().decode('utf-8', 'replace').rstrip('\r\n')
+        payload = self.rfile.read(MAX_PAYLOAD)
+
+        stdout = io.TextIOWrapper(io.BytesIO(), encoding='utf-8', write_through=True)
+        _local.stdin = io.TextIOWrapper(io.BytesIO(payload), encoding='utf-8')
+        _local.stdout = stdout
+        set_request_dir(cwd or None)
+        try:
+            exit_code = _load_hook(hook_name).main() or 0
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 0
+        except Exception:
+            # Hooks fail silently - never block Claude because of the daemon
+            traceback.print_exc(file=sys.stderr)
+            exit_code = 0
+        finally:
+            _local.stdin = None
+            _local.stdout = None
+            set_request_dir(None)
+
+        self.wfile.write(f'{exit_code}\n'.encode() + stdout.buffer.getvalue())
+
+
+class HookDaemon(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def main():
+    sys.stdin = _ThreadStream('stdin', sys.stdin)
+    sys.stdout = _ThreadStream('stdout', sys.stdout)
+
+    with HookDaemon((HOST, PORT), HookHandler) as server:
+        sys.stderr.write(f'Hook daemon listening on {HOST}:{PORT}\n')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
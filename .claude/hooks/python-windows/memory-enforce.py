@@ -3,56 +3,87 @@
 import sys
 import json
 import os
+import re
+
+try:
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _loads = json.loads
+    _dumps = json.dumps
+
+# Tools that should always check memory
+_CRITICAL_TOOLS = frozenset(('Edit', 'Write', 'MultiEdit', 'Bash'))
+_FILE_TOOLS = frozenset(('Edit', 'Write', 'MultiEdit'))
+
+# Bash commands worth a reminder - one case-insensitive scan, no lowered copy
+_ENFORCE_RE = re.compile(r'install|migrate|build|test', re.IGNORECASE)
+
+# tool_name sits near the top of the payload - sniff it before paying for a full parse
+_TOOL_NAME_RE = re.compile(rb'"tool_name"\s*:\s*"([^"]+)"')
+_CRITICAL_NAMES = frozenset(name.encode() for name in _CRITICAL_TOOLS)
+
+# Reminder text is static apart from the file name
+_EDIT_PREFIX = "MEMORY CHECK REQUIRED for "
+_EDIT_SUFFIX = ": Search memory for past issues with this file before proceeding."
+_BASH_MSG = "MEMORY CHECK: Review past command executions and errors before running this command."
+
+# Plain allow responses are serialized once, not on every tool call
+_APPROVED_JSON = _dumps({
+    "permissionDecision": "allow",
+    "permissionDecisionReason": "Operation approved"
+})
+_ALLOW_JSON = _dumps({
+    "permissionDecision": "allow",
+    "permissionDecisionReason": "Non-critical operation"
+})
 
 def main():
     try:
         # Read stdin
-        stdin_data = sys.stdin.read()
-        data = json.loads(stdin_data)
+        stdin_data = sys.stdin.buffer.read(262144)  # same cap as _hooklib.MAX_PAYLOAD
         
-        tool_name = data.get('tool_name', '')
-        tool_input = data.get('tool_input', {})
+        # Most tool calls are read-only - allow them without parsing the JSON
+        match = _TOOL_NAME_RE.search(stdin_data, 0, 512)
+        if match and match.group(1) not in _CRITICAL_NAMES:
+            print(_ALLOW_JSON)
+            return 0
         
-        # Tools that should always check memory
-        memory_critical_tools = ['Edit', 'Write', 'MultiEdit', 'Bash']
+        data = _loads(stdin_data)
         
-        if tool_name in memory_critical_tools:
-            # Build enforcement message based on tool
-            enforcement_msg = None
-            
-            if tool_name in ['Edit', 'Write', 'MultiEdit']:
-                file_path = tool_input.get('file_path', '')
-                if file_path:
-                    basename = os.path.basename(file_path)
-                    enforcement_msg = f"MEMORY CHECK REQUIRED for {basename}: Search memory for past issues with this file before proceeding."
-            
-            elif tool_name == 'Bash':
-                command = tool_input.get('command', '')
-                if command and any(word in command.lower() for word in ['install', 'migrate', 'build', 'test']):
-                    enforcement_msg = "MEMORY CHECK: Review past command executions and errors before running this command."
-            
-            if enforcement_msg:
-                # Return a response that adds context but still allows the operation
-                response = {
-                    "permissionDecision": "allow",
-                    "permissionDecisionReason": "Auto-approved with memory reminder",
-                    "systemMessage": enforcement_msg
-                }
-            else:
-                # Default allow
-                response = {
-                    "permissionDecision": "allow",
-                    "permissionDecisionReason": "Operation approved"
-                }
-        else:
+        tool_name = data.get('tool_name', '')
+        tool_input = data.get('tool_input') or {}
+        
+        if tool_name not in _CRITICAL_TOOLS:
             # Non-critical tools - just allow
-            response = {
-                "permissionDecision": "allow",
-                "permissionDecisionReason": "Non-critical operation"
-            }
+            print(_ALLOW_JSON)
+            return 0
+        
+        # Build enforcement message based on tool
+        enforcement_msg = None
         
-        # Output JSON response
-        print(json.dumps(response))
+        if tool_name in _FILE_TOOLS:
+            file_path = tool_input.get('file_path', '')
+            if file_path:
+                enforcement_msg = _EDIT_PREFIX + os.path.basename(file_path) + _EDIT_SUFFIX
+        
+        elif tool_name == 'Bash':
+            command = tool_input.get('command', '')
+            if command and _ENFORCE_RE.search(command):
+                enforcement_msg = _BASH_MSG
+        
+        if enforcement_msg:
+            # Return a response that adds context but still allows the operation
+            print(_dumps({
+                "permissionDecision": "allow",
+                "permissionDecisionReason": "Auto-approved with memory reminder",
+                "systemMessage": enforcement_msg
+            }))
+        else:
+            # Default allow
+            print(_APPROVED_JSON)
         
     except Exception as e:
         # On error, allow but note the issue
@@ -60,7 +91,7 @@ def main():
             "permissionDecision": "allow",
             "permissionDecisionReason": f"Enforcement check error: {str(e)[:50]}"
         }
-        print(json.dumps(fallback))
+        print(_dumps(fallback))
     
     return 0
 
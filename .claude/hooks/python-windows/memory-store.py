@@ -1,102 +1,111 @@
 #!/usr/bin/env python3
 """Memory store hook - captures and stores tool results to memory"""
 import sys
-import json
 import os
+import re
 from datetime import datetime
 
+from _hooklib import MAX_PAYLOAD, exit_silently, loads, log, project_name, queue_memory, response_text
+
+# Bash commands worth remembering - one case-insensitive scan, no lowered copy
+_SIG_RE = re.compile(r'migrate|install|build|deploy|test|create|init|git', re.IGNORECASE)
+
+# Raw-payload probe - no stringifying the response when 'error' is not in the bytes
+_ERROR_BYTES_RE = re.compile(rb'error', re.IGNORECASE)
+_ERROR_RE = re.compile(r'error', re.IGNORECASE)
+
+# HTTP fallback for oversized batches - (connect, read): a server that is down
+# or still starting costs 100 ms, not the whole read budget
+_STORE_TIMEOUT = (0.1, 0.5)
+
+def _has_error(tool_response):
+    """Structured error flags first, then one case-insensitive scan of the response text"""
+    if isinstance(tool_response, dict):
+        if tool_response.get('error') or tool_response.get('is_error') or tool_response.get('status') == 'error':
+            return True
+    return _ERROR_RE.search(response_text(tool_response, MAX_PAYLOAD)) is not None
+
 def main():
-    try:
-        # Read stdin - REQUIRED for PostToolUse hooks
-        stdin_data = sys.stdin.read()
-        data = json.loads(stdin_data)
-        
-        tool_name = data.get('tool_name', '')
-        tool_input = data.get('tool_input', {})
-        tool_response = data.get('tool_response', {})
-        
-        # Extract key information
-        file_path = tool_input.get('file_path', '')
-        command = tool_input.get('command', '')
-        
-        # Only process if we have something to store
-        if not (file_path or command):
-            return 0
+    # Read stdin - REQUIRED for PostToolUse hooks
+    stdin_data = sys.stdin.buffer.read(MAX_PAYLOAD)
+    
+    # Read-only tools (Read, Grep, Glob) carry neither key - skip parsing entirely
+    if b'"file_path"' not in stdin_data and b'"command"' not in stdin_data:
+        return 0
+    
+    data = loads(stdin_data)
+    
+    tool_name = data.get('tool_name', '')
+    tool_input = data.get('tool_input') or {}
+    tool_response = data.get('tool_response', {})
+    
+    # Extract key information
+    file_path = tool_input.get('file_path', '')
+    command = tool_input.get('command', '')
+    
+    # Only process if we have something to store
+    if not (file_path or command):
+        return 0
+    
+    memory_data = None
+    now = datetime.now().isoformat()
+    # Per request - under the hook daemon one process serves every project
+    project = project_name(data)
+    
+    # Store errors for learning
+    if _ERROR_BYTES_RE.search(stdin_data) and _has_error(tool_response):
+        title = f'Error: {tool_name}'
+        if file_path:
+            title += f' on {os.path.basename(file_path)}'
+        elif command:
+            title += f' - {command[:30]}'
         
+        memory_data = {
+            'title': title,
+            'content': f'Tool: {tool_name}\nInput: {str(tool_input)[:200]}\nError: {response_text(tool_response, 500)}',
+            'source': 'claude_code',
+            'technologies': ['error', tool_name.lower()],
+            'complexity': 'high',
+            'project': project,
+            'timestamp': now
+        }
+    
+    # Store significant successful operations
+    elif tool_name in ['Write', 'MultiEdit'] and file_path:
+        memory_data = {
+            'title': f'Modified: {os.path.basename(file_path)}',
+            'content': f'File: {file_path}\nOperation: {tool_name}\nTimestamp: {now}',
+            'source': 'claude_code',
+            'technologies': ['file_operation'],
+            'complexity': 'low',
+            'project': project
+        }
+    
+    # Store significant bash operations
+    elif tool_name == 'Bash' and command:
+        if _SIG_RE.search(command):
+            memory_data = {
+                'title': f'Command: {command[:50]}',
+                'content': f'Command: {command}\nResult: Success\nTimestamp: {now}',
+                'source': 'claude_code',
+                'technologies': ['bash', 'command'],
+                'complexity': 'medium',
+                'project': project
+            }
+    
+    # Queue it - bursts go to the server as one batch
+    if memory_data:
         try:
-            import requests
-            
-            # Store errors for learning
-            if 'error' in str(tool_response).lower():
-                title = f'Error: {tool_name}'
-                if file_path:
-                    title += f' on {os.path.basename(file_path)}'
-                elif command:
-                    title += f' - {command[:30]}'
-                
-                memory_data = {
-                    'title': title,
-                    'content': f'Tool: {tool_name}\nInput: {str(tool_input)[:200]}\nError: {str(tool_response)[:500]}',
-                    'source': 'claude_code',
-                    'technologies': ['error', tool_name.lower()],
-                    'complexity': 'high',
-                    'project': os.path.basename(os.getcwd()),
-                    'timestamp': datetime.now().isoformat()
-                }
-                
-                # Fire and forget
-                requests.post(
-                    'http://localhost:8080/api/add_memory',
-                    json=memory_data,
-                    timeout=0.5
-                )
-            
-            # Store significant successful operations
-            elif tool_name in ['Write', 'MultiEdit'] and file_path:
-                memory_data = {
-                    'title': f'Modified: {os.path.basename(file_path)}',
-                    'content': f'File: {file_path}\nOperation: {tool_name}\nTimestamp: {datetime.now().isoformat()}',
-                    'source': 'claude_code',
-                    'technologies': ['file_operation'],
-                    'complexity': 'low',
-                    'project': os.path.basename(os.getcwd())
-                }
-                
-                requests.post(
-                    'http://localhost:8080/api/add_memory',
-                    json=memory_data,
-                    timeout=0.5
-                )
-            
-            # Store significant bash operations
-            elif tool_name == 'Bash' and command:
-                significant_keywords = ['migrate', 'install', 'build', 'deploy', 'test', 'create', 'init', 'git']
-                if any(keyword in command.lower() for keyword in significant_keywords):
-                    memory_data = {
-                        'title': f'Command: {command[:50]}',
-                        'content': f'Command: {command}\nResult: Success\nTimestamp: {datetime.now().isoformat()}',
-                        'source': 'claude_code',
-                        'technologies': ['bash', 'command'],
-                        'complexity': 'medium',
-                        'project': os.path.basename(os.getcwd())
-                    }
-                    
-                    requests.post(
-                        'http://localhost:8080/api/add_memory',
-                        json=memory_data,
-                        timeout=0.5
-                    )
-                    
-        except:
-            # Silent fail - PostToolUse shouldn't block operations
-            pass
-            
-    except:
-        # Silent fail on any error
-        pass
+            queue_memory(memory_data, timeout=_STORE_TIMEOUT)
+        except OSError as e:
+            # Queue file unavailable - skip this one; anything else reaches the excepthook
+            log(f'[SKIPPED] {memory_data["title"]}: {e}')
+            return 0
+        log(f"[STORED] {memory_data['title']}")
     
     # PostToolUse hooks just return 0
     return 0
 
 if __name__ == '__main__':
+    sys.excepthook = exit_silently
     sys.exit(main())
\ No newline at end of file
@@ -2,71 +2,70 @@
 # -*- coding: utf-8 -*-
 """Claude Code Hook - Save session summary at end"""
 
+import http.client
 import sys
-import os
-os.environ['PYTHONIOENCODING'] = 'utf-8'
-import json
-import requests
 from datetime import datetime
-import os
+
+from _hooklib import ADD_MEMORY_PATH, MAX_PAYLOAD, exit_silently, flush_memory_queue, loads, post, project_name
 
 def main():
-    try:
-        # Read JSON payload from stdin if available
-        json_payload = ""
-        if not sys.stdin.isatty():
-            json_payload = sys.stdin.read()
-        
-        session_data = {}
-        if json_payload:
-            try:
-                session_data = json.loads(json_payload)
-            except:
-                pass
-        
-        # Prepare session summary
-        current_time = datetime.now().isoformat()
-        project_name = os.path.basename(os.getcwd())
-        
-        # Create a basic session summary
-        summary = f"Session ended at {current_time} for project {project_name}"
-        
-        # If we have session data, enhance the summary
-        if session_data:
-            tools_used = session_data.get('tools_used', [])
-            files_modified = session_data.get('files_modified', [])
-            
-            if tools_used:
-                summary += f"\nTools used: {', '.join(set(tools_used[:5]))}"
-            if files_modified:
-                summary += f"\nFiles modified: {', '.join(files_modified[:5])}"
-        
-        # Store session summary
-        memory_data = {
-            'title': f'Session: {project_name} - {datetime.now().strftime("%Y-%m-%d %H:%M")}',
-            'content': summary,
-            'source': 'claude_code',
-            'technologies': ['session-tracking'],
-            'complexity': 'low',
-            'project': project_name
-        }
-        
-        response = requests.post(
-            'http://localhost:8080/api/add_memory',
-            json=memory_data,
-            timeout=3
-        )
+    # Read JSON payload from stdin if available
+    json_payload = b""
+    if not sys.stdin.isatty():
+        json_payload = sys.stdin.buffer.read(MAX_PAYLOAD)
+    
+    session_data = {}
+    if json_payload:
+        try:
+            session_data = loads(json_payload)
+        except:
+            pass
+    
+    # Prepare session summary
+    now = datetime.now()
+    project = project_name(session_data)
+    
+    # Create a basic session summary
+    summary = f"Session ended at {now.isoformat()} for project {project}"
+    
+    # If we have session data, enhance the summary
+    if session_data:
+        tools_used = session_data.get('tools_used', [])
+        files_modified = session_data.get('files_modified', [])
         
-        if response.status_code == 200:
-            print("● Session saved to memory")
-        else:
-            print("● Session save failed")
-            
-    except Exception as e:
-        # Silent fail - don't block session end
-        pass
+        if tools_used:
+            summary += f"\nTools used: {', '.join(set(tools_used[:5]))}"
+        if files_modified:
+            summary += f"\nFiles modified: {', '.join(files_modified[:5])}"
+    
+    # Store session summary
+    memory_data = {
+        'title': f'Session: {project} - {now.strftime("%Y-%m-%d %H:%M")}',
+        'content': summary,
+        'source': 'claude_code',
+        'technologies': ['session-tracking'],
+        'complexity': 'low',
+        'project': project
+    }
+    
+    # Send anything memory-store still has queued
+    flush_memory_queue()
+    
+    # Wait for the answer so the message reports what actually happened - the
+    # 50 ms connect timeout keeps an offline server from holding up session end
+    try:
+        status, _ = post(ADD_MEMORY_PATH, memory_data, timeout=(0.05, 2.0))
+    except (OSError, http.client.HTTPException):
+        print("● Memory offline - session not saved")
+        return 0
+    
+    if 200 <= status < 300:
+        print("● Session saved to memory")
+    else:
+        print("● Session save failed")
     
     return 0
 
 if __name__ == '__main__':
+    sys.excepthook = exit_silently
     sys.exit(main())
\ No newline at end of file
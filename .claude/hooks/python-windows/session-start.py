@@ -3,26 +3,20 @@
 """Claude Code Hook - Session start (context injection only, no operations)"""
 
 import sys
-import json
-import os
 from datetime import datetime
 
+from _hooklib import dumps, project_name
+
 def main():
-    # Read stdin - SessionStart hooks receive session data
-    try:
-        stdin_data = sys.stdin.read()
-        if stdin_data:
-            session_data = json.loads(stdin_data)
-    except:
-        session_data = {}
+    # The SessionStart payload isn't used - don't block reading or parsing it
     
     # Build context to inject into the session
-    project_name = os.path.basename(os.getcwd())
+    project = project_name()
     current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
     
     # Create the context message
     context_lines = [
-        f"● Memory system ready for {project_name} at {current_time}"
+        f"● Memory system ready for {project} at {current_time}"
     ]
     
     # Output the additionalContext for SessionStart
@@ -31,7 +25,7 @@ def main():
     }
     
     # Output as JSON
-    print(json.dumps(response))
+    print(dumps(response))
     
     return 0
 
@@ -2,56 +2,56 @@
 """Claude Code Hook - Check memory before running tests"""
 
 import sys
-import json
-import requests
+import re
+
+from _hooklib import MAX_PAYLOAD, SEARCH_PATH, exit_silently, loads, post
+
+# npm test / npm run test / jest / pytest as whole words
+_TEST_CMD_RE = re.compile(r'\b(npm\s+(?:run\s+)?test|jest|pytest)\b')
 
 def main():
-    try:
-        # Read JSON payload from stdin
-        json_payload = sys.stdin.read()
-        data = json.loads(json_payload)
+    # Read JSON payload from stdin
+    json_payload = sys.stdin.buffer.read(MAX_PAYLOAD)
+    data = loads(json_payload)
+    
+    # Extract tool name and command
+    tool_name = data.get('tool_name', '')
+    tool_input = data.get('tool_input') or {}
+    command = tool_input.get('command', '')
+    
+    # Check if this is a test command
+    if tool_name == 'Bash' and _TEST_CMD_RE.search(command):
+        print("[TEST] Checking memory for past test failures...")
         
-        # Extract tool name and command
-        tool_name = data.get('tool_name', '')
-        command = data.get('tool_input', {}).get('command', '')
+        # Search for test-related issues
+        status, body = post(
+            SEARCH_PATH,
+            {
+                'query': 'test failed error jest pytest npm',
+                'max_results': 3,
+                'similarity_threshold': 0.5,
+                'preview_contains': ['test', 'fail']
+            },
+            timeout=(0.05, 2.0)
+        )
         
-        # Check if this is a test command
-        if tool_name == 'Bash' and any(test_cmd in command for test_cmd in ['npm test', 'npm run test', 'jest', 'pytest']):
-            print("[TEST] Checking memory for past test failures...")
-            
-            # Search for test-related issues
-            response = requests.post(
-                'http://localhost:8080/api/search',
-                json={
-                    'query': 'test failed error jest pytest npm',
-                    'max_results': 3,
-                    'similarity_threshold': 0.5
-                },
-                timeout=3
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                if result.get('success'):
-                    # Check for past test failures
-                    test_issues = [
-                        r for r in result.get('data', {}).get('results', [])
-                        if 'test' in r.get('preview', '').lower() and 'fail' in r.get('preview', '').lower()
-                    ]
-                    
-                    if test_issues:
-                        print('[WARNING] Found past test issues:')
-                        for issue in test_issues[:2]:
-                            print(f"  - {issue.get('title', 'Unknown')} ({issue.get('date', 'Unknown')})")
-                            preview = issue.get('preview', '')
-                            if 'FAIL' in preview or 'failed' in preview:
-                                print(f"    Issue: {preview[:150]}...")
-                        print('\n[ACTION] Consider checking these specific test areas before running.')
-    except Exception:
-        # Silent fail
-        pass
+        if status == 200:
+            result = loads(body)
+            if result.get('success'):
+                # Past test failures - the server already kept only previews mentioning both
+                test_issues = result.get('data', {}).get('results', [])
+                
+                if test_issues:
+                    print('[WARNING] Found past test issues:')
+                    for issue in test_issues[:2]:
+                        print(f"  - {issue.get('title', 'Unknown')} ({issue.get('date', 'Unknown')})")
+                        preview = issue.get('preview', '')
+                        if 'FAIL' in preview or 'failed' in preview:
+                            print(f"    Issue: {preview[:150]}...")
+                    print('\n[ACTION] Consider checking these specific test areas before running.')
     
     return 0
 
 if __name__ == '__main__':
+    sys.excepthook = exit_silently
     sys.exit(main())
\ No newline at end of file
@@ -64,7 +64,7 @@ function Test-Dependencies {
     & ".\venv\Scripts\Activate.ps1"
     
     # Test required packages
-    $required_packages = @("flask", "flask_cors", "flask_limiter", "chromadb", "pydantic")
+    $required_packages = @("flask", "flask_cors", "chromadb", "pydantic")
     $missing_packages = @()
     
     foreach ($package in $required_packages) {
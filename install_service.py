@@ -7,13 +7,12 @@ This allows the API to start automatically with Windows and run in the backgroun
 import sys
 import os
 import subprocess
+import py_compile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from string import Template
 
-def create_service_script():
-    """Create a service wrapper script"""
-    service_script = Path(__file__).parent / "memory_api_service.py"
-    
-    service_content = f'''#!/usr/bin/env python3
+_SERVICE_TEMPLATE = Template('''#!/usr/bin/env python3
 """
 Windows Service wrapper for Claude Memory API
 """
@@ -29,7 +28,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 # Set up logging for service  
 logging.basicConfig(
-    filename=r'{Path(__file__).parent / "service.log"}',
+    filename=r'$logfile',
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
@@ -40,23 +39,20 @@ def run_service():
         logging.info("Starting Claude Memory API Service")
         
         # Change to the correct directory
-        os.chdir(r'{Path(__file__).parent}')
+        os.chdir(r'$dir')
         
         # Import and run the API server
-        from memory_api_server import app, API_HOST, API_PORT, logger
+        from memory_api_server import API_HOST, API_PORT, serve_app, start_udp_listener
         
-        logging.info(f"Service starting on {{API_HOST}}:{{API_PORT}}")
+        logging.info(f"Service starting on {API_HOST}:{API_PORT}")
+        start_udp_listener()
         
-        # Run the Flask app (use Waitress for production)
-        try:
-            from waitress import serve
-            serve(app, host=API_HOST, port=API_PORT)
-        except ImportError:
-            # Fallback to Flask development server
-            app.run(host=API_HOST, port=API_PORT, debug=False)
+        # Waitress (or the Flask fallback) with the worker_threads and
+        # max_concurrent_requests settings from config.json
+        serve_app()
             
     except Exception as e:
-        logging.error(f"Service error: {{e}}")
+        logging.error(f"Service error: {e}")
         import traceback
         logging.error(traceback.format_exc())
         time.sleep(5)  # Wait before potential restart
@@ -74,46 +70,17 @@ if __name__ == "__main__":
             run_service()
     else:
         run_service()
-'''
-    
-    with open(service_script, 'w') as f:
-        f.write(service_content)
-        
-    return service_script
-
-def install_waitress():
-    """Install Waitress WSGI server for production"""
-    try:
-        subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'waitress'])
-        print("✅ Waitress WSGI server installed")
-        return True
-    except subprocess.CalledProcessError:
-        print("⚠️  Could not install Waitress - will use Flask development server")
-        return False
+''')
 
-def create_startup_batch():
-    """Create a batch file for manual service start"""
-    batch_file = Path(__file__).parent / "start_service.bat"
-    
-    batch_content = f'''@echo off
+_BATCH_TEMPLATE = Template('''@echo off
 echo Starting Claude Memory API Service...
-cd /d "{Path(__file__).parent}"
+cd /d "$dir"
 call venv\\Scripts\\activate.bat
 python memory_api_service.py start
 pause
-'''
-    
-    with open(batch_file, 'w') as f:
-        f.write(batch_content)
-        
-    print(f"✅ Startup batch file created: {batch_file}")
-    return batch_file
+''')
 
-def create_task_scheduler_xml():
-    """Create XML for Windows Task Scheduler"""
-    xml_file = Path(__file__).parent / "claude_memory_api_task.xml"
-    
-    xml_content = f'''<?xml version="1.0" encoding="UTF-16"?>
+_XML_TEMPLATE = Template('''<?xml version="1.0" encoding="UTF-16"?>
 <Task version="1.2" xmlns="http://schemas.microsoft.com/windows/2004/02/mit/task">
   <RegistrationInfo>
     <Description>Claude Memory API Service - Starts automatically with Windows</Description>
@@ -155,39 +122,104 @@ def create_task_scheduler_xml():
   </Settings>
   <Actions>
     <Exec>
-      <Command>{Path(__file__).parent / "start_service.bat"}</Command>
-      <WorkingDirectory>{Path(__file__).parent}</WorkingDirectory>
+      <Command>$batch_file</Command>
+      <WorkingDirectory>$dir</WorkingDirectory>
     </Exec>
   </Actions>
-</Task>'''
+</Task>''')
+
+def _write(path, content):
+    """Write one generated file"""
+    with open(path, 'w') as f:
+        f.write(content)
+    return path
+
+def create_service_script():
+    """Create a service wrapper script"""
+    service_script = Path(__file__).parent / "memory_api_service.py"
     
-    with open(xml_file, 'w') as f:
-        f.write(xml_content)
-        
-    print(f"✅ Task Scheduler XML created: {xml_file}")
-    return xml_file
+    service_content = _SERVICE_TEMPLATE.safe_substitute(
+        dir=Path(__file__).parent,
+        logfile=Path(__file__).parent / "service.log"
+    )
+    
+    return _write(service_script, service_content)
+
+def install_waitress():
+    """Install Waitress WSGI server for production"""
+    try:
+        subprocess.check_call([sys.executable, '-m', 'pip', 'install', 'waitress'])
+        print("✅ Waitress WSGI server installed")
+        return True
+    except subprocess.CalledProcessError:
+        print("⚠️  Could not install Waitress - will use Flask development server")
+        return False
+
+def create_startup_batch():
+    """Create a batch file for manual service start"""
+    batch_file = Path(__file__).parent / "start_service.bat"
+    
+    batch_content = _BATCH_TEMPLATE.safe_substitute(dir=Path(__file__).parent)
+    
+    return _write(batch_file, batch_content)
+
+def create_task_scheduler_xml():
+    """Create XML for Windows Task Scheduler"""
+    xml_file = Path(__file__).parent / "claude_memory_api_task.xml"
+    
+    xml_content = _XML_TEMPLATE.safe_substitute(
+        dir=Path(__file__).parent,
+        batch_file=Path(__file__).parent / "start_service.bat"
+    )
+    
+    return _write(xml_file, xml_content)
+
+def compile_hooks():
+    """Precompile the Claude Code hooks into __pycache__
+
+    The hooks run with python -B and never write bytecode themselves. The
+    cached copies are used when a module is imported: _hooklib by every hook,
+    and every hook under the hook daemon.
+    """
+    hooks_dir = Path(__file__).parent / ".claude" / "hooks" / "python-windows"
+    compiled = []
+    
+    for script in sorted(hooks_dir.glob("*.py")):
+        try:
+            py_compile.compile(str(script), doraise=True)
+            compiled.append(script)
+        except py_compile.PyCompileError as e:
+            print(f"⚠️  Could not compile {script.name}: {e.msg}")
+    
+    print(f"✅ Precompiled {len(compiled)} hook scripts in {hooks_dir}")
+    return compiled
 
 def main():
     """Main installation function"""
     print("🔧 Installing Claude Memory API as Background Service")
     print()
     
-    # Step 1: Create service script
-    print("1. Creating service wrapper script...")
-    service_script = create_service_script()
+    # Step 1: Create service script, startup batch file and Task Scheduler XML
+    # (independent files, so they are written in parallel)
+    print("1. Creating service files...")
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        service_future = executor.submit(create_service_script)
+        batch_future = executor.submit(create_startup_batch)
+        xml_future = executor.submit(create_task_scheduler_xml)
+    service_script = service_future.result()
+    batch_file = batch_future.result()
+    xml_file = xml_future.result()
     print(f"✅ Service script created: {service_script}")
+    print(f"✅ Startup batch file created: {batch_file}")
+    print(f"✅ Task Scheduler XML created: {xml_file}")
     
     # Step 2: Install production server
     print("\\n2. Installing production WSGI server...")
     install_waitress()
     
-    # Step 3: Create startup batch file
-    print("\\n3. Creating startup batch file...")
-    batch_file = create_startup_batch()
-    
-    # Step 4: Create Task Scheduler XML
-    print("\\n4. Creating Task Scheduler configuration...")
-    xml_file = create_task_scheduler_xml()
+    # Step 3: Precompile hooks
+    print("\\n3. Precompiling Claude Code hooks...")
+    compile_hooks()
     
     print("\\n" + "="*60)
     print("🎉 INSTALLATION COMPLETE!")
@@ -215,6 +247,9 @@ def main():
     print("- Open browser to: http://localhost:8080/api/health")
     print("- Should see: {'success': true, 'data': {'status': 'healthy'}}")
     print()
+    print("⚡ HOOK START-UP:")
+    print("- Re-run this installer after editing a hook so its __pycache__ copy stays current")
+    print()
     print("🔗 The Memory API will now be available from ANY project!")
 
 if __name__ == "__main__":
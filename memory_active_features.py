@@ -3,104 +3,209 @@ Active Memory Features - Makes the memory server proactive
 Adds file watching, error detection, and automatic memory engagement
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from pathlib import Path
 from datetime import datetime
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 import threading
-import queue
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
 import re
 import json
 import logging
 import time
 import os
 
+try:
+    # Optional - serializes the endpoint payloads much faster than Flask's json
+    import orjson
+except ImportError:
+    orjson = None
+
 # Create blueprint for active features
 active_memory = Blueprint('active_memory', __name__)
 
 # Setup logger
 logger = logging.getLogger('memory_api.active')
 
+# Log handles stay open between polls, except on Windows where an open handle
+# would stop RotatingFileHandler from renaming the file
+_KEEP_LOGS_OPEN = os.name != 'nt'
+
+# New log content is read in blocks of this many bytes
+_LOG_CHUNK = 1 << 20
+
+# Code files the watcher reacts to - a tuple so str.endswith can take it directly
+_CODE_EXTS = ('.py', '.js', '.ts', '.tsx', '.jsx', '.sql', '.css', '.html')
+
+# Tool and dependency directories whose churn never warrants a memory check
+_IGNORED_DIRS = ('.git', '__pycache__', 'node_modules', '.venv', 'venv')
+_IGNORED_DIR_MARKERS = tuple(
+    f'{sep}{name}{sep}' for name in _IGNORED_DIRS for sep in ('/', '\\')
+)
+
+# File extension -> technology tag
+_TECH_MAP = {
+    '.ts': 'typescript', '.tsx': 'typescript',
+    '.js': 'javascript', '.jsx': 'javascript',
+    '.py': 'python', '.sql': 'sql',
+    '.css': 'css', '.html': 'html'
+}
+
+# Error normalization - quoted strings, bare numbers and paths in one pass;
+# the named group that matched picks the placeholder
+_NORM_RE = re.compile(r'(?P<s>["\'].*?["\'])|(?P<n>\b\d+\b)|(?P<p>[/\\][\w\-\./\\]+)')
+_NORM_SUBS = {'s': 'STRING', 'n': 'NUM', 'p': 'PATH'}
+
+# Solutions recorded in memory previews ("... fixed by pinning the version.")
+_SOLUTION_RE = re.compile(r'fixed by (.+?)\.', re.IGNORECASE)
+
+class BoundedDict(OrderedDict):
+    """OrderedDict that drops its least recently written entries past max_entries"""
+    
+    def __init__(self, max_entries, on_evict=None):
+        super().__init__()
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+    
+    def __setitem__(self, key, value):
+        if key in self:
+            self.move_to_end(key)
+        super().__setitem__(key, value)
+        if len(self) > self.max_entries:
+            evicted, _ = self.popitem(last=False)
+            if self.on_evict:
+                self.on_evict(evicted)
+
 class MemoryContext:
-    """Tracks current context for automatic memory engagement"""
+    """Tracks current context for automatic memory engagement
+    
+    Mutated from the file watcher, the log monitor and Flask request threads.
+    File/technology state and error state have separate locks so the watcher
+    and the log monitor don't contend; critical sections are just the
+    container updates.
+    """
     
     def __init__(self):
+        self._files_lock = threading.Lock()
+        self._errors_lock = threading.Lock()
+        # Files being worked on - the deque keeps recency order, the set O(1) lookups
+        self._current_files_order = deque(maxlen=256)
         self.current_files = set()
-        self.recent_errors = []
+        self.recent_errors = deque(maxlen=20)  # Last 20 errors
         self.recent_queries = []
         self.project_root = None
         self.technologies = set()
-        self.error_patterns = {}
-        self.file_history = []
-        self.decision_queue = queue.Queue()
+        # Errors seen twice / three times or more - kept up to date by
+        # add_error so the endpoints never rescan error_patterns
+        self.repeated_errors = set()
+        self.frequent_error_keys = set()
+        self.error_patterns = BoundedDict(1000, on_evict=self._forget_error)
+        self.file_history = deque(maxlen=50)  # Last 50 files
+        # append/popleft are atomic - no lock or condition variable needed
+        self.decision_queue = deque(maxlen=1000)
         
     def update_file(self, file_path):
         """Track file being worked on"""
-        self.current_files.add(file_path)
-        self.file_history.append({
+        entry = {
             'path': file_path,
             'timestamp': datetime.now().isoformat()
-        })
-        # Keep only last 50 files
-        if len(self.file_history) > 50:
-            self.file_history.pop(0)
-            
-        # Detect technology from file extension
-        ext = Path(file_path).suffix.lower()
-        tech_map = {
-            '.ts': 'typescript', '.tsx': 'typescript',
-            '.js': 'javascript', '.jsx': 'javascript',
-            '.py': 'python', '.sql': 'sql',
-            '.css': 'css', '.html': 'html'
         }
-        if ext in tech_map:
-            self.technologies.add(tech_map[ext])
-    
-    def add_error(self, error_text, context=None):
-        """Track errors for pattern detection"""
-        error_key = self._normalize_error(error_text)
-        
-        if error_key not in self.error_patterns:
-            self.error_patterns[error_key] = {
-                'count': 0,
-                'first_seen': datetime.now().isoformat(),
-                'last_seen': None,
-                'contexts': []
-            }
+        # Detect technology from file extension - a slice, no Path on the hot path
+        dot = file_path.rfind('.')
+        tech = _TECH_MAP.get(file_path[dot:].lower()) if dot >= 0 else None
         
-        self.error_patterns[error_key]['count'] += 1
-        self.error_patterns[error_key]['last_seen'] = datetime.now().isoformat()
-        if context:
-            self.error_patterns[error_key]['contexts'].append(context)
+        with self._files_lock:
+            if file_path in self.current_files:
+                self._current_files_order.remove(file_path)
+            elif len(self._current_files_order) == self._current_files_order.maxlen:
+                self.current_files.discard(self._current_files_order[0])
+            self._current_files_order.append(file_path)
+            self.current_files.add(file_path)
+            self.file_history.append(entry)
+            if tech:
+                self.technologies.add(tech)
+    
+    def add_technologies(self, technologies):
+        """Record technologies reported by Claude"""
+        with self._files_lock:
+            self.technologies.update(technologies)
+    
+    def get_technologies(self):
+        """Snapshot of the detected technologies"""
+        with self._files_lock:
+            return list(self.technologies)
+    
+    def add_error(self, error_text, context=None, now_iso=None):
+        """Track errors for pattern detection
         
-        self.recent_errors.append({
-            'error': error_text,
-            'timestamp': datetime.now().isoformat(),
-            'context': context
-        })
+        now_iso lets callers recording a burst of errors share one timestamp.
+        """
+        if now_iso is None:
+            now_iso = datetime.now().isoformat()
+        error_key = self._normalize_error(error_text)
         
-        # Keep only last 20 errors
-        if len(self.recent_errors) > 20:
-            self.recent_errors.pop(0)
+        with self._errors_lock:
+            pattern = self.error_patterns.get(error_key)
+            if pattern is None:
+                pattern = self.error_patterns[error_key] = {
+                    'count': 0,
+                    'first_seen': now_iso,
+                    'last_seen': None,
+                    'contexts': []
+                }
+            else:
+                # Recently seen errors are the last to be evicted
+                self.error_patterns.move_to_end(error_key)
+            
+            pattern['count'] += 1
+            pattern['last_seen'] = now_iso
+            if context:
+                pattern['contexts'].append(context)
+            if pattern['count'] == 2:
+                self.repeated_errors.add(error_key)
+            elif pattern['count'] == 3:
+                self.frequent_error_keys.add(error_key)
+            
+            self.recent_errors.append({
+                'error': error_text,
+                'timestamp': now_iso,
+                'context': context
+            })
+    
+    def frequent_errors(self):
+        """Normalized errors seen three or more times"""
+        with self._errors_lock:
+            return list(self.frequent_error_keys)
+    
+    def _forget_error(self, error_key):
+        """Drop an evicted error from the repeat sets (called under _errors_lock)"""
+        self.repeated_errors.discard(error_key)
+        self.frequent_error_keys.discard(error_key)
     
     def _normalize_error(self, error):
         """Normalize error for pattern matching"""
         # Remove specific paths, numbers, quotes
-        normalized = error.lower()
-        normalized = re.sub(r'["\'].*?["\']', 'STRING', normalized)
-        normalized = re.sub(r'\b\d+\b', 'NUM', normalized)
-        normalized = re.sub(r'[/\\][\w\-\./\\]+', 'PATH', normalized)
+        normalized = _NORM_RE.sub(lambda m: _NORM_SUBS[m.lastgroup], error.lower())
         return normalized[:100]  # Truncate for consistency
     
     def get_context_summary(self):
         """Get current context for memory queries"""
+        with self._files_lock:
+            current_files = list(self._current_files_order)[-5:]
+            technologies = list(self.technologies)
+            recent_files = [f['path'] for f in list(self.file_history)[-10:]]
+        with self._errors_lock:
+            error_count = len(self.recent_errors)
+            repeated_errors = list(self.repeated_errors)[:50]
+        
         return {
-            'current_files': list(self.current_files)[-5:],
-            'technologies': list(self.technologies),
-            'error_count': len(self.recent_errors),
-            'repeated_errors': [k for k, v in self.error_patterns.items() if v['count'] > 1],
-            'recent_files': [f['path'] for f in self.file_history[-10:]]
+            'current_files': current_files,
+            'technologies': technologies,
+            'error_count': error_count,
+            'repeated_errors': repeated_errors,
+            'recent_files': recent_files
         }
 
 # Global context instance
@@ -109,35 +214,57 @@ memory_context = MemoryContext()
 class ClaudeFileWatcher(FileSystemEventHandler):
     """Watches for file changes and triggers memory checks"""
     
-    def __init__(self, searcher, project_root):
-        self.searcher = searcher
+    def __init__(self, search, project_root, check_interval=5):
+        self.search = search  # searcher.search, or the server's concurrency-limited wrapper
         self.project_root = Path(project_root)
-        self.last_check = {}
-        self.check_interval = 5  # Minimum seconds between checks for same file
+        self.last_check = BoundedDict(2000)
+        self.check_interval = check_interval  # Minimum seconds between checks for same file
+        # Searches run off the watchdog thread so events keep draining;
+        # at most one search per file is queued or running
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='memsearch')
+        self._inflight = set()
+        self._inflight_lock = threading.Lock()
+        # Hash of the last warnings queued per file - re-saving a file doesn't
+        # queue the same warnings again
+        self._last_warning_hash = BoundedDict(2000)
+        self._warning_lock = threading.Lock()
         
     def on_modified(self, event):
         if event.is_directory:
             return
             
-        file_path = Path(event.src_path)
+        # Skip non-code files (.pyc, .swp, editor backups...) and anything in
+        # git/cache/dependency directories before building a Path
+        src = event.src_path
+        if not src.endswith(_CODE_EXTS):
+            return
+        if any(marker in src for marker in _IGNORED_DIR_MARKERS):
+            return
         
-        # Skip non-code files
-        if file_path.suffix not in ['.py', '.js', '.ts', '.tsx', '.jsx', '.sql', '.css', '.html']:
+        # Rate limit checks - keyed on the raw path, on the monotonic clock
+        now = time.monotonic()
+        prev = self.last_check.get(src)
+        if prev is not None and now - prev < self.check_interval:
             return
         
-        # Rate limit checks
-        now = time.time()
-        if file_path in self.last_check:
-            if now - self.last_check[file_path] < self.check_interval:
-                return
+        self.last_check[src] = now
         
-        self.last_check[file_path] = now
+        file_path = Path(src)
         
         # Update context
         memory_context.update_file(str(file_path))
         
         # Trigger memory check
-        self._check_memory_for_file(file_path)
+        with self._inflight_lock:
+            if file_path in self._inflight:
+                return
+            self._inflight.add(file_path)
+        future = self._executor.submit(self._check_memory_for_file, file_path)
+        future.add_done_callback(lambda _: self._search_done(file_path))
+    
+    def _search_done(self, file_path):
+        with self._inflight_lock:
+            self._inflight.discard(file_path)
     
     def _check_memory_for_file(self, file_path):
         """Check memory for relevant information about this file"""
@@ -145,7 +272,7 @@ class ClaudeFileWatcher(FileSystemEventHandler):
             relative_path = file_path.relative_to(self.project_root)
             query = f"{relative_path.name} {relative_path.parent} error bug fix"
             
-            results = self.searcher.search(
+            results = self.search(
                 query=query,
                 n_results=3,
                 min_similarity=0.5
@@ -165,7 +292,14 @@ class ClaudeFileWatcher(FileSystemEventHandler):
                             })
                 
                 if warnings:
-                    memory_context.decision_queue.put({
+                    key = str(relative_path)
+                    warning_hash = hash(tuple((w['memory'], w['date']) for w in warnings))
+                    with self._warning_lock:
+                        if self._last_warning_hash.get(key) == warning_hash:
+                            return
+                        self._last_warning_hash[key] = warning_hash
+                    
+                    memory_context.decision_queue.append({
                         'type': 'file_warning',
                         'file': str(relative_path),
                         'warnings': warnings,
@@ -179,21 +313,49 @@ class ClaudeFileWatcher(FileSystemEventHandler):
 class LogMonitor:
     """Monitors logs for errors and patterns"""
     
-    def __init__(self, log_files):
+    def __init__(self, log_files, poll_interval=2):
         self.log_files = log_files
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
         self.last_positions = {}
+        self._handles = {}  # log file -> (inode, open file)
         self.error_patterns = [
             r'ERROR|CRITICAL|FATAL',
             r'Exception|Error:|Failed|Failure',
             r'Traceback \(most recent call last\)',
             r'TypeError|ValueError|KeyError|AttributeError',
         ]
+        # Whole error lines in one finditer pass over a block of log text.
+        # The group that matched is the leftmost hit on the line, not
+        # necessarily the first pattern in list order - see _scan_errors
+        self._error_line_re = re.compile(
+            '^.*?(?:' + '|'.join(f'({p})' for p in self.error_patterns) + ').*$',
+            re.IGNORECASE | re.MULTILINE
+        )
+        self._pattern_res = [re.compile(p, re.IGNORECASE) for p in self.error_patterns]
         self.monitoring = False
         self.monitor_thread = None
         
+    def _scan_errors(self, text):
+        """Yield (line, pattern) for every error line in a block of log text
+        
+        The pattern is the first one in error_patterns order that matches the
+        line, as when each line was tested pattern by pattern.
+        """
+        for match in self._error_line_re.finditer(text):
+            line = match.group(0)
+            index = match.lastindex - 1
+            # Only error lines get here - recheck the higher-priority patterns
+            for earlier in range(index):
+                if self._pattern_res[earlier].search(line):
+                    index = earlier
+                    break
+            yield line, self.error_patterns[index]
+    
     def start_monitoring(self):
         """Start monitoring logs in background thread"""
         self.monitoring = True
+        self._stop.clear()
         self.monitor_thread = threading.Thread(target=self._monitor_loop)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
@@ -202,51 +364,107 @@ class LogMonitor:
     def stop_monitoring(self):
         """Stop monitoring"""
         self.monitoring = False
+        self._stop.set()
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
+        for log_file in list(self._handles):
+            self._close_log(log_file)
         logger.info("Stopped log monitoring")
     
     def _monitor_loop(self):
         """Main monitoring loop"""
         while self.monitoring:
             for log_file in self.log_files:
-                if Path(log_file).exists():
-                    self._check_log_file(log_file)
-            time.sleep(2)  # Check every 2 seconds
+                self._check_log_file(log_file)
+            # Wakes immediately on stop_monitoring instead of sleeping out the interval
+            self._stop.wait(self.poll_interval)
+    
+    def _open_log(self, log_file):
+        """Return the handle for a log file, reopening it after rotation or truncation"""
+        st = os.stat(log_file)
+        handle = self._handles.get(log_file)
+        if handle is not None:
+            inode, f = handle
+            if inode == st.st_ino and st.st_size >= f.tell():
+                return f
+            f.close()
+            del self._handles[log_file]
+            self.last_positions[log_file] = 0
+        
+        # Start over if the file shrank while it was closed
+        last_pos = self.last_positions.get(log_file, 0)
+        if st.st_size < last_pos:
+            last_pos = 0
+        
+        f = open(log_file, 'rb', buffering=65536)
+        f.seek(last_pos)
+        self._handles[log_file] = (st.st_ino, f)
+        return f
+    
+    def _close_log(self, log_file):
+        """Close a cached log handle"""
+        handle = self._handles.pop(log_file, None)
+        if handle is not None:
+            handle[1].close()
     
     def _check_log_file(self, log_file):
         """Check a log file for new errors"""
         try:
-            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                # Get last position
-                last_pos = self.last_positions.get(log_file, 0)
-                f.seek(last_pos)
+            f = self._open_log(log_file)
+            
+            # Scan new content a block at a time - one regex pass per block
+            # rather than one Python-level search per line
+            now_iso = None  # One timestamp for every error in this poll
+            while True:
+                data = f.read(_LOG_CHUNK)
+                if not data:
+                    break
                 
-                # Read new lines
-                new_lines = f.readlines()
-                if new_lines:
-                    self.last_positions[log_file] = f.tell()
-                    
-                    # Check for errors
-                    for line in new_lines:
-                        for pattern in self.error_patterns:
-                            if re.search(pattern, line, re.IGNORECASE):
-                                memory_context.add_error(line.strip(), {
-                                    'log_file': log_file,
-                                    'pattern': pattern
-                                })
-                                break
+                # Leave a partially written last line for the next poll
+                end = data.rfind(b'\n') + 1
+                if not end and len(data) == _LOG_CHUNK:
+                    end = len(data)  # A single enormous line - take it as is
+                if end < len(data):
+                    f.seek(end - len(data), os.SEEK_CUR)
+                
+                for line, pattern in self._scan_errors(data[:end].decode('utf-8', 'ignore')):
+                    if now_iso is None:
+                        now_iso = datetime.now().isoformat()
+                    memory_context.add_error(line.strip(), {
+                        'log_file': log_file,
+                        'pattern': pattern
+                    }, now_iso=now_iso)
+                
+                if len(data) < _LOG_CHUNK:
+                    break
+            
+            self.last_positions[log_file] = f.tell()
+            if not _KEEP_LOGS_OPEN:
+                self._close_log(log_file)
                                 
+        except FileNotFoundError:
+            # Not created yet, or mid-rotation
+            self._close_log(log_file)
         except Exception as e:
+            self._close_log(log_file)
             logger.error(f"Error monitoring log {log_file}: {e}")
 
+def _json_response(payload):
+    """jsonify() through orjson when it is installed"""
+    if orjson is None:
+        return jsonify(payload)
+    return current_app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY),
+        mimetype='application/json'
+    )
+
 # Active memory endpoints
 @active_memory.route('/api/active/status', methods=['GET'])
 def get_active_status():
     """Get current active memory status"""
     context_summary = memory_context.get_context_summary()
     
-    return jsonify({
+    return _json_response({
         'success': True,
         'data': {
             'context': context_summary,
@@ -254,7 +472,7 @@ def get_active_status():
                 'file_watcher': hasattr(active_memory, 'file_observer') and active_memory.file_observer.is_alive(),
                 'log_monitor': hasattr(active_memory, 'log_monitor') and active_memory.log_monitor.monitoring
             },
-            'pending_decisions': memory_context.decision_queue.qsize()
+            'pending_decisions': len(memory_context.decision_queue)
         }
     })
 
@@ -264,14 +482,14 @@ def get_pending_decisions():
     decisions = []
     
     # Get up to 10 pending decisions
-    for _ in range(min(10, memory_context.decision_queue.qsize())):
+    for _ in range(min(10, len(memory_context.decision_queue))):
         try:
-            decision = memory_context.decision_queue.get_nowait()
+            decision = memory_context.decision_queue.popleft()
             decisions.append(decision)
-        except queue.Empty:
+        except IndexError:
             break
     
-    return jsonify({
+    return _json_response({
         'success': True,
         'data': {
             'decisions': decisions,
@@ -288,7 +506,7 @@ def update_context():
         memory_context.current_task = data['current_task']
     
     if 'technologies' in data:
-        memory_context.technologies.update(data['technologies'])
+        memory_context.add_technologies(data['technologies'])
     
     if 'current_file' in data:
         memory_context.update_file(data['current_file'])
@@ -296,7 +514,7 @@ def update_context():
     if 'error' in data:
         memory_context.add_error(data['error'], data.get('error_context'))
     
-    return jsonify({
+    return _json_response({
         'success': True,
         'data': {
             'context_updated': True,
@@ -318,16 +536,14 @@ def check_before_action():
         query_parts.append(Path(params['file_path']).name)
         memory_context.update_file(params['file_path'])
     
-    query_parts.extend(memory_context.technologies)
+    query_parts.extend(memory_context.get_technologies())
     query_parts.append('error bug fix solution')
     
     query = ' '.join(query_parts)
     
-    # Search memory
-    from memory_search import MemorySearcher
-    searcher = MemorySearcher()
-    
-    results = searcher.search(
+    # Search memory with the server's searcher - building one per request
+    # reloaded the embedding model and collection every time
+    results = active_memory.search(
         query=query,
         n_results=5,
         min_similarity=0.4
@@ -349,7 +565,7 @@ def check_before_action():
             })
             
             # Extract solution if present
-            solution_match = re.search(r'fixed by (.+?)\.', preview, re.IGNORECASE)
+            solution_match = _SOLUTION_RE.search(preview)
             if solution_match:
                 suggestions.append(f"Previous solution: {solution_match.group(1)}")
         
@@ -358,16 +574,15 @@ def check_before_action():
             suggestions.append(f"Related success: {result.get('title', 'Unknown')}")
     
     # Check error patterns
-    if memory_context.error_patterns:
-        repeated_errors = [k for k, v in memory_context.error_patterns.items() if v['count'] > 2]
-        if repeated_errors:
-            warnings.append({
-                'level': 'medium',
-                'message': f"Repeated errors detected: {len(repeated_errors)} patterns",
-                'patterns': repeated_errors[:3]
-            })
+    repeated_errors = memory_context.frequent_errors()
+    if repeated_errors:
+        warnings.append({
+            'level': 'medium',
+            'message': f"Repeated errors detected: {len(repeated_errors)} patterns",
+            'patterns': repeated_errors[:3]
+        })
     
-    return jsonify({
+    return _json_response({
         'success': True,
         'data': {
             'action': action,
@@ -378,11 +593,22 @@ def check_before_action():
         }
     })
 
-def initialize_active_memory(app, searcher, project_root=None):
-    """Initialize active memory features"""
+def initialize_active_memory(app, searcher, project_root=None, check_interval=5,
+                             log_poll_interval=2, observer_timeout=1, search=None):
+    """Initialize active memory features
+    
+    check_interval is the minimum gap in seconds between memory checks for the
+    same file, log_poll_interval how often watched logs are read, and
+    observer_timeout how long the file observer waits between event batches.
+    search replaces searcher.search for every memory search made here - the
+    server passes its bounded_search so these share its concurrency limit.
+    """
+    search = search or searcher.search
     
     # Register blueprint
     app.register_blueprint(active_memory)
+    active_memory.searcher = searcher
+    active_memory.search = search
     
     # Set project root
     if project_root:
@@ -394,12 +620,14 @@ def initialize_active_memory(app, searcher, project_root=None):
     # Start file watcher if project root exists
     if memory_context.project_root and memory_context.project_root.exists():
         try:
-            event_handler = ClaudeFileWatcher(searcher, memory_context.project_root)
-            observer = Observer()
+            event_handler = ClaudeFileWatcher(search, memory_context.project_root, check_interval)
+            # Observer is the platform's native backend (inotify, FSEvents,
+            # ReadDirectoryChangesW) - it only polls where none exists
+            observer = Observer(timeout=observer_timeout)
             observer.schedule(event_handler, str(memory_context.project_root), recursive=True)
             observer.start()
             active_memory.file_observer = observer
-            logger.info(f"Started file watcher for {memory_context.project_root}")
+            logger.info(f"Started {type(observer).__name__} file watcher for {memory_context.project_root}")
         except Exception as e:
             logger.error(f"Failed to start file watcher: {e}")
     
@@ -410,7 +638,7 @@ def initialize_active_memory(app, searcher, project_root=None):
         str(Path(memory_context.project_root) / 'app.log'),
     ]
     
-    log_monitor = LogMonitor([f for f in log_files if Path(f).exists()])
+    log_monitor = LogMonitor([f for f in log_files if Path(f).exists()], log_poll_interval)
     log_monitor.start_monitoring()
     active_memory.log_monitor = log_monitor
     
@@ -1,22 +1,34 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, abort
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from datetime import datetime
-import traceback
 import logging
 from pathlib import Path
 import json
 import uuid
+import secrets
 import sys
 import os
+import time
+import socket
+import threading
+import atexit
+import queue
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    # Optional - C encoder for response bodies; falls back to Flask's jsonify
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add scripts directory to path for imports
 sys.path.append(str(Path(__file__).parent / "scripts"))
 
 # Import your existing modules
 from memory_search import MemorySearcher
-from index_summaries import SummaryIndexer
 
 # Import active memory features (optional - will load if available)
 try:
@@ -29,20 +41,108 @@ except ImportError:
 # Import curation features (optional - will load if available)
 try:
     from memory_curation_api import initialize_curation_api
+    from memory_curator import memory_quality_score
     CURATION_API_AVAILABLE = True
 except ImportError:
     CURATION_API_AVAILABLE = False
+    memory_quality_score = None
     print("Curation API not available - install scikit-learn and rich for curation features")
 
 app = Flask(__name__)
 CORS(app, origins=["http://localhost:3000", "http://127.0.0.1:3000"])  # Enable CORS for web interface
 
 # Rate limiting
-limiter = Limiter(
-    app=app,
-    key_func=get_remote_address,
-    default_limits=["100 per minute"]
-)
+_RATE_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+def _parse_rate(limit):
+    """'20 per minute' -> (capacity, tokens per second)"""
+    count, _, period = limit.split()
+    capacity = int(count)
+    return capacity, capacity / _RATE_PERIODS[period.rstrip('s')]
+
+class TokenBucketLimiter:
+    """Per-client, per-endpoint token buckets
+    
+    A check is a dict lookup and a little float arithmetic under one lock.
+    Endpoints without their own limit use the default.
+    """
+    
+    def __init__(self, app, default_limit):
+        self.default = _parse_rate(default_limit)
+        self.route_limits = {}  # endpoint name -> (capacity, rate)
+        self.buckets = {}  # (client address, endpoint) -> (tokens, last refill)
+        self.lock = threading.Lock()
+        app.before_request(self.check_request)
+    
+    def limit(self, limit_string):
+        """Decorator giving a view its own limit - apply below @app.route"""
+        def decorator(view):
+            self.route_limits[view.__name__] = _parse_rate(limit_string)
+            return view
+        return decorator
+    
+    def allow(self, key, capacity, rate):
+        """Take a token from the key's bucket; False if it is empty"""
+        now = time.monotonic()
+        with self.lock:
+            tokens, last = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            allowed = tokens >= 1
+            self.buckets[key] = (tokens - 1 if allowed else tokens, now)
+        return allowed
+    
+    def check_request(self):
+        endpoint = request.endpoint
+        if endpoint is None:
+            return  # Unknown URL - let the 404 handler answer
+        capacity, rate = self.route_limits.get(endpoint, self.default)
+        if not self.allow((request.remote_addr, endpoint), capacity, rate):
+            abort(429)
+
+limiter = TokenBucketLimiter(app, "100 per minute")
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson else 0
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes through orjson
+
+    Only dumps() is replaced - request bodies are still parsed by the stdlib
+    provider. Types orjson doesn't know go to Flask's own default(), which
+    raises for anything it can't encode; datetimes are passed through to it
+    too, so they keep Flask's format.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        option = _ORJSON_OPTIONS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+# jsonify() calls (the blueprints use it) go through orjson when it is installed
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Compact output for the paths that still go through jsonify (even in debug mode)
+app.json.compact = True
+_loads = orjson.loads if orjson else json.loads
+_dumps = (lambda obj: orjson.dumps(obj).decode()) if orjson else json.dumps
+
+@lru_cache(maxsize=1024)
+def parse_technologies(stored):
+    """Decode the JSON 'technologies' metadata column
+
+    Most rows share a handful of technology lists, so decoded values are
+    cached - as tuples, so a cached value can't be changed by a caller.
+    """
+    return tuple(_loads(stored))
+
+def ojson(obj, status=200):
+    """jsonify() through orjson when it is installed"""
+    if orjson is None:
+        response = jsonify(obj)
+        response.status_code = status
+        return response
+    return app.response_class(orjson.dumps(obj, option=_ORJSON_OPTIONS), status=status, mimetype='application/json')
 
 # Load configuration
 CONFIG_FILE = Path(__file__).parent / "config.json"
@@ -67,7 +167,11 @@ DB_PATH = Path(__file__).parent / config["database"]["path"]
 COLLECTION_NAME = config["database"]["collection_name"]
 API_HOST = config["api"]["host"]
 API_PORT = config["api"]["port"]
+UDP_PORT = config["api"].get("udp_port", 8081)
 DEBUG_MODE = config["api"]["debug"]
+WORKER_THREADS = config.get("performance", {}).get("worker_threads", 8)
+MAX_CONNECTIONS = config.get("performance", {}).get("max_concurrent_requests", 100)
+SEARCH_CONCURRENCY = config.get("performance", {}).get("max_concurrent_searches", 8)
 
 # Setup enhanced logging
 log_level = getattr(logging, config.get("logging", {}).get("level", "INFO").upper())
@@ -78,7 +182,7 @@ log_path = Path(log_file)
 log_path.parent.mkdir(exist_ok=True)
 
 # Configure logging with rotation
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 
 # Remove default handlers
 for handler in logging.root.handlers[:]:
@@ -88,8 +192,91 @@ for handler in logging.root.handlers[:]:
 logger = logging.getLogger('memory_api')
 logger.setLevel(log_level)
 
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that writes through a 64 KiB buffer
+    
+    Records are not flushed one by one; a background thread flushes every
+    flush_interval seconds, and rollover/close flush as usual. Rollover only
+    renames the live file aside and reopens it - shifting the numbered backups
+    happens on a separate worker so the writer never waits on that chain.
+    """
+    
+    def __init__(self, *args, flush_interval=0.1, **kwargs):
+        self._deferring = False
+        self._rollovers = 0
+        self._rotator = ThreadPoolExecutor(max_workers=1, thread_name_prefix='log-rotate')
+        super().__init__(*args, **kwargs)
+        self._closing = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, args=(flush_interval,), name='log-flush', daemon=True
+        )
+        self._flusher.start()
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=65536,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def shouldRollover(self, record):
+        # TextIOWrapper.tell() flushes the buffer; the binary layer's doesn't
+        # (it can lag by the text layer's few KB of pending writes)
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes > 0:
+            msg = f"{self.format(record)}{self.terminator}"
+            if self.stream.buffer.tell() + len(msg) >= self.maxBytes:
+                return True
+        return False
+    
+    def emit(self, record):
+        # StreamHandler.emit flushes after every record - skip that here
+        self._deferring = True
+        try:
+            super().emit(record)
+        finally:
+            self._deferring = False
+    
+    def flush(self):
+        if not self._deferring:
+            super().flush()
+    
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if self.backupCount > 0 and os.path.exists(self.baseFilename):
+            # One rename here; the single worker shifts .1..N in rollover order
+            self._rollovers += 1
+            pending = f"{self.baseFilename}.rotating{self._rollovers}"
+            os.replace(self.baseFilename, pending)
+            self._rotator.submit(self._shift_backups, pending)
+        if not self.delay:
+            self.stream = self._open()
+    
+    def _shift_backups(self, pending):
+        try:
+            for i in range(self.backupCount - 1, 0, -1):
+                sfn = self.rotation_filename(f"{self.baseFilename}.{i}")
+                dfn = self.rotation_filename(f"{self.baseFilename}.{i + 1}")
+                if os.path.exists(sfn):
+                    os.replace(sfn, dfn)
+            dfn = self.rotation_filename(f"{self.baseFilename}.1")
+            if os.path.exists(dfn):
+                os.remove(dfn)
+            self.rotate(pending, dfn)
+        except OSError as e:
+            sys.stderr.write(f"Log rotation failed for {pending}: {e}\n")
+    
+    def close(self):
+        self._closing.set()
+        super().close()
+        self._rotator.shutdown(wait=True)
+    
+    def _flush_loop(self, interval):
+        while not self._closing.wait(interval):
+            self.flush()
+
 # File handler with rotation
-file_handler = RotatingFileHandler(
+file_handler = BufferedRotatingFileHandler(
     log_file, 
     maxBytes=10*1024*1024,  # 10MB
     backupCount=5
@@ -111,29 +298,52 @@ simple_formatter = logging.Formatter(
 file_handler.setFormatter(detailed_formatter)
 console_handler.setFormatter(simple_formatter)
 
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+# Request threads only enqueue records; a listener thread does the file and
+# console writes (and rotation) off the request path
+log_queue = queue.Queue(-1)
+queue_handler = QueueHandler(log_queue)
+log_listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger.addHandler(queue_handler)
 
 # Set Flask app logger
 app.logger.handlers = []
-app.logger.addHandler(file_handler)
-app.logger.addHandler(console_handler)
+app.logger.addHandler(queue_handler)
 app.logger.setLevel(log_level)
 
-# Performance monitoring
-request_count = 0
-total_response_time = 0.0
+# Performance monitoring - request threads update these under _perf_lock
+_perf_lock = threading.Lock()
+_perf = {'requests': 0, 'responses': 0, 'response_time_ms': 0.0}
 
 def get_performance_stats():
     """Get current performance statistics"""
-    global request_count, total_response_time
+    with _perf_lock:
+        request_count = _perf['requests']
+        responses = _perf['responses']
+        total_ms = _perf['response_time_ms']
     return {
         'request_count': request_count,
-        'average_response_time_ms': (total_response_time / request_count * 1000) if request_count > 0 else 0,
-        'uptime_seconds': (datetime.now() - startup_time).total_seconds()
+        'average_response_time_ms': total_ms / responses if responses else 0,
+        'uptime_seconds': time.monotonic() - startup_monotonic
     }
 
 startup_time = datetime.now()
+startup_monotonic = time.monotonic()
+
+# Response timestamps - regenerated only when the millisecond changes
+_iso_cache = (0, '')
+
+def _iso_now():
+    """Current local time as ISO 8601 with millisecond resolution"""
+    global _iso_cache
+    ms = int(time.time() * 1000)
+    cached_ms, text = _iso_cache
+    if ms != cached_ms:
+        text = datetime.fromtimestamp(ms / 1000).isoformat(timespec='milliseconds')
+        _iso_cache = (ms, text)
+    return text
 
 # Initialize once at startup
 try:
@@ -144,7 +354,6 @@ try:
     logger.info(f"Debug mode: {DEBUG_MODE}")
     
     searcher = MemorySearcher()
-    indexer = SummaryIndexer()
     
     doc_count = searcher.collection.count()
     logger.info(f"Connected to ChromaDB successfully")
@@ -158,14 +367,119 @@ except Exception as e:
     logger.error(f"Check that ChromaDB is installed and database path is accessible")
     raise
 
+# The searcher and indexer open the same collection (same path and name,
+# default embedding function) - bind the handle once for the endpoints
+COLLECTION = searcher.collection
+
+# SummaryIndexer loads its own SentenceTransformer model, and the endpoints
+# write through COLLECTION - so it is only imported and built on first use
+_indexer = None
+_indexer_lock = threading.Lock()
+
+def get_indexer():
+    """The shared SummaryIndexer, created the first time it is needed"""
+    global _indexer
+    with _indexer_lock:
+        if _indexer is None:
+            from index_summaries import SummaryIndexer
+            logger.info("Loading SummaryIndexer")
+            _indexer = SummaryIndexer()
+        return _indexer
+
+class LazyIndexer:
+    """Stands in for the SummaryIndexer until an attribute is actually used"""
+    
+    def __getattr__(self, name):
+        return getattr(get_indexer(), name)
+
+# Document count for /api/health, /api/memories and /api/session_start -
+# kept in step with this server's adds and deletes, and re-read from ChromaDB
+# every _COUNT_TTL seconds in case another process wrote to the collection
+_COUNT_TTL = 30.0
+_count_lock = threading.Lock()
+_count_cache = {'count': doc_count, 'fetched_at': time.monotonic()}
+
+def collection_count():
+    """Number of documents in the collection, re-read at most every _COUNT_TTL seconds"""
+    count, fetched_at = _count_cache['count'], _count_cache['fetched_at']
+    now = time.monotonic()
+    if count is None or now - fetched_at > _COUNT_TTL:
+        count = refresh_count()
+    return count
+
+def refresh_count():
+    """Read the count from ChromaDB and reset the cache"""
+    with _count_lock:
+        count = COLLECTION.count()
+        _count_cache.update(count=count, fetched_at=time.monotonic())
+    return count
+
+def adjust_count(delta):
+    """Apply this server's own adds (+n) or deletes (-n) to the cached count"""
+    with _count_lock:
+        if _count_cache['count'] is not None:
+            _count_cache['count'] = max(0, _count_cache['count'] + delta)
+
+# Embedding + vector query is CPU heavy - cap how many run at once so a burst
+# of requests queues here instead of oversubscribing the cores
+_search_slots = threading.BoundedSemaphore(SEARCH_CONCURRENCY)
+_search_stats_lock = threading.Lock()
+_search_stats = {'in_flight': 0, 'waiting': 0}
+
+def bounded_search(*args, **kwargs):
+    """searcher.search() limited to SEARCH_CONCURRENCY concurrent calls"""
+    with _search_stats_lock:
+        _search_stats['waiting'] += 1
+    with _search_slots:
+        with _search_stats_lock:
+            _search_stats['waiting'] -= 1
+            _search_stats['in_flight'] += 1
+        try:
+            return searcher.search(*args, **kwargs)
+        finally:
+            with _search_stats_lock:
+                _search_stats['in_flight'] -= 1
+
+# Request IDs - 8 hex chars each, generated 4096 at a time from one urandom
+# read and topped up by a background thread when the pool runs low
+_ID_BATCH = 4096
+_ID_LOW_WATER = 1024
+_id_pool = deque()
+_id_refill = threading.Event()
+
+def _generate_ids():
+    """Add _ID_BATCH IDs to the pool from a single os.urandom call"""
+    blob = os.urandom(4 * _ID_BATCH).hex()
+    _id_pool.extend(blob[i:i + 8] for i in range(0, len(blob), 8))
+
+def _id_refiller():
+    """Top the pool back up whenever next_request_id() reports it is low"""
+    while True:
+        _id_refill.wait()
+        _id_refill.clear()
+        while len(_id_pool) < _ID_LOW_WATER:
+            _generate_ids()
+
+def next_request_id():
+    """Take a request ID from the pool; generate one directly if it is empty"""
+    if len(_id_pool) < _ID_LOW_WATER:
+        _id_refill.set()
+    try:
+        return _id_pool.pop()
+    except IndexError:
+        return secrets.token_hex(4)
+
+_generate_ids()
+threading.Thread(target=_id_refiller, name='request-id-refill', daemon=True).start()
+
 # Enhanced middleware for logging and monitoring
 @app.before_request
 def before_request():
-    global request_count
-    request_count += 1
+    with _perf_lock:
+        _perf['requests'] += 1
     
-    request.request_id = str(uuid.uuid4())[:8]  # Shorter ID for readability
-    request.start_time = datetime.now()
+    request.request_id = next_request_id()  # Short ID for readability
+    request.start_ns = time.monotonic_ns()
     
     # Log request details
     client_ip = request.remote_addr
@@ -179,12 +493,11 @@ def before_request():
 
 @app.after_request
 def after_request(response):
-    global total_response_time
-    
-    if hasattr(request, 'start_time'):
-        duration = (datetime.now() - request.start_time).total_seconds()
-        duration_ms = duration * 1000
-        total_response_time += duration
+    if hasattr(request, 'start_ns'):
+        duration_ms = (time.monotonic_ns() - request.start_ns) / 1e6
+        with _perf_lock:
+            _perf['responses'] += 1
+            _perf['response_time_ms'] += duration_ms
         
         # Log response details
         logger.info(f"[RESPONSE] {response.status_code} - {duration_ms:.2f}ms [ID: {getattr(request, 'request_id', 'unknown')}]")
@@ -199,57 +512,94 @@ def after_request(response):
         
     return response
 
-# Error handlers
+# Endpoint failures log a full traceback at most once per _TRACEBACK_INTERVAL
+# for each (endpoint, exception type); repeats in between get one short line
+_TRACEBACK_INTERVAL = 60.0
+_traceback_lock = threading.Lock()
+_traceback_seen = {}  # (endpoint, exception type) -> [last traceback time, repeats since]
+
+def log_error(message, error):
+    """app.logger.error with rate-limited tracebacks - call from an except block"""
+    key = (request.endpoint, type(error).__name__)
+    now = time.monotonic()
+    with _traceback_lock:
+        entry = _traceback_seen.get(key)
+        if entry is None or now - entry[0] >= _TRACEBACK_INTERVAL:
+            repeats = entry[1] if entry else 0
+            _traceback_seen[key] = [now, 0]
+            full = True
+        else:
+            entry[1] += 1
+            repeats = entry[1]
+            full = False
+    
+    if full:
+        suffix = f" ({repeats} repeats since the last traceback)" if repeats else ""
+        app.logger.error(f"{message}{suffix}", exc_info=error)
+    else:
+        app.logger.error(f"{message} [repeat {repeats}]")
+
+# Error handlers - bodies are pre-built skeletons with only the per-request
+# values filled in, so 404 probes and 429 rejections stay cheap
+_404_SKELETON = (b'{"success":false,"error":{"code":"NOT_FOUND","message":"Endpoint not found",'
+                 b'"details":{"path":%s,"method":%s}},'
+                 b'"metadata":{"timestamp":"%s","request_id":"%s","execution_time_ms":0}}')
+_429_SKELETON = (b'{"success":false,"error":{"code":"RATE_LIMIT_EXCEEDED","message":"Too many requests",'
+                 b'"details":{"retry_after":"60 seconds"}},'
+                 b'"metadata":{"timestamp":"%s","request_id":"%s","execution_time_ms":0}}')
+_500_SKELETON = (b'{"success":false,"error":{"code":"INTERNAL_SERVER_ERROR","message":"Internal server error",'
+                 b'"details":{}},'
+                 b'"metadata":{"timestamp":"%s","request_id":"%s","execution_time_ms":0}}')
+
+_json_str = orjson.dumps if orjson else (lambda value: json.dumps(value).encode())
+
+def _error_response(body, status):
+    """Wrap a pre-encoded JSON body in a response"""
+    return app.response_class(body, status=status, mimetype='application/json')
+
 @app.errorhandler(404)
 def not_found(error):
-    logger.warning(f"[404] Not Found: {request.method} {request.path} [ID: {getattr(request, 'request_id', 'unknown')}]")
-    return jsonify({
-        'success': False,
-        'error': {
-            'code': 'NOT_FOUND',
-            'message': 'Endpoint not found',
-            'details': {'path': request.path, 'method': request.method}
-        },
-        'metadata': {
-            'timestamp': datetime.now().isoformat(),
-            'request_id': getattr(request, 'request_id', 'unknown'),
-            'execution_time_ms': 0
-        }
-    }), 404
+    request_id = getattr(request, 'request_id', 'unknown')
+    logger.warning(f"[404] Not Found: {request.method} {request.path} [ID: {request_id}]")
+    # The path is client-controlled, so it is JSON-encoded rather than pasted in
+    body = _404_SKELETON % (_json_str(request.path), _json_str(request.method),
+                            _iso_now().encode(), request_id.encode())
+    return _error_response(body, 404)
 
 @app.errorhandler(429)
 def rate_limit_exceeded(error):
-    logger.warning(f"[RATE_LIMIT] Exceeded: {request.remote_addr} [ID: {getattr(request, 'request_id', 'unknown')}]")
-    return jsonify({
-        'success': False,
-        'error': {
-            'code': 'RATE_LIMIT_EXCEEDED',
-            'message': 'Too many requests',
-            'details': {'retry_after': '60 seconds'}
-        },
-        'metadata': {
-            'timestamp': datetime.now().isoformat(),
-            'request_id': getattr(request, 'request_id', 'unknown'),
-            'execution_time_ms': 0
-        }
-    }), 429
+    request_id = getattr(request, 'request_id', 'unknown')
+    logger.warning(f"[RATE_LIMIT] Exceeded: {request.remote_addr} [ID: {request_id}]")
+    return _error_response(_429_SKELETON % (_iso_now().encode(), request_id.encode()), 429)
 
 @app.errorhandler(500)
 def internal_error(error):
-    logger.error(f"[500] Internal server error: {error} [ID: {getattr(request, 'request_id', 'unknown')}]")
-    return jsonify({
-        'success': False,
-        'error': {
-            'code': 'INTERNAL_SERVER_ERROR',
-            'message': 'Internal server error',
-            'details': {}
+    request_id = getattr(request, 'request_id', 'unknown')
+    logger.error(f"[500] Internal server error: {error} [ID: {request_id}]")
+    return _error_response(_500_SKELETON % (_iso_now().encode(), request_id.encode()), 500)
+
+def _format_result(result):
+    """Shape one searcher result for the /api/search response"""
+    get = result.get
+    similarity = get('similarity', 0)
+    source = get('source', 'unknown')
+    date = get('date', 'unknown')
+    return {
+        "id": result['filename'] if 'filename' in result else str(uuid.uuid4()),
+        "title": get('title', 'Untitled'),
+        "similarity": similarity,
+        "relevance_score": get('hybrid_score', similarity),
+        "preview": get('preview', '')[:300],
+        "metadata": {
+            "date": date,
+            "complexity": get('complexity', 'unknown'),
+            "technologies": get('technologies', []),
+            "source": source,
+            "file_path": str(get('file_path', ''))
         },
-        'metadata': {
-            'timestamp': datetime.now().isoformat(),
-            'request_id': getattr(request, 'request_id', 'unknown'),
-            'execution_time_ms': 0
-        }
-    }), 500
+        "source": source,
+        "date": date
+    }
 
 @app.route('/api/search', methods=['POST'])
 @limiter.limit("20 per minute")
@@ -258,7 +608,7 @@ def search_memory():
     try:
         data = request.json
         if not data or 'query' not in data:
-            return jsonify({
+            return ojson({
                 "success": False,
                 "error": {
                     "code": "VALIDATION_ERROR",
@@ -266,22 +616,24 @@ def search_memory():
                     "details": {}
                 },
                 "metadata": {
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": _iso_now(),
                     "request_id": getattr(request, 'request_id', 'unknown'),
                     "execution_time_ms": 0
                 }
-            }), 400
+            }, 400)
         
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
         
         # Extract search parameters
         query = data['query']
         max_results = min(data.get('max_results', 3), 10)  # Cap at 10
         similarity_threshold = data.get('similarity_threshold', 0.3)
         source_filter = data.get('source_filter')  # claude_code or claude_desktop
+        sort_by = data.get('sort_by')  # 'similarity' - default order is hybrid relevance
+        preview_contains = data.get('preview_contains')  # substrings that must all appear in the preview
         
         # Perform search
-        results = searcher.search(
+        results = bounded_search(
             query=query, 
             n_results=max_results,
             min_similarity=similarity_threshold
@@ -291,29 +643,24 @@ def search_memory():
         if source_filter:
             results = [r for r in results if r.get('source') == source_filter]
         
-        # Format results according to API spec
-        formatted_results = []
-        for result in results:
-            formatted_results.append({
-                "id": result.get('filename', str(uuid.uuid4())),
-                "title": result.get('title', 'Untitled'),
-                "similarity": result.get('similarity', 0),
-                "relevance_score": result.get('hybrid_score', result.get('similarity', 0)),
-                "preview": result.get('preview', '')[:300],
-                "metadata": {
-                    "date": result.get('date', 'unknown'),
-                    "complexity": result.get('complexity', 'unknown'),
-                    "technologies": result.get('technologies', []),
-                    "source": result.get('source', 'unknown'),
-                    "file_path": str(result.get('file_path', ''))
-                },
-                "source": result.get('source', 'unknown'),
-                "date": result.get('date', 'unknown')
-            })
+        # Case-insensitive AND of substrings, so callers don't download results they'd discard
+        if preview_contains:
+            needles = [str(n).lower() for n in preview_contains]
+            results = [
+                r for r in results
+                if all(n in r.get('preview', '').lower() for n in needles)
+            ]
         
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        # Callers that threshold on raw similarity can stop at the first miss
+        if sort_by == 'similarity':
+            results.sort(key=lambda r: r.get('similarity', 0), reverse=True)
         
-        return jsonify({
+        # Format results according to API spec - only the survivors of the filters above
+        formatted_results = list(map(_format_result, results))
+        
+        execution_time = (time.monotonic_ns() - start_ns) / 1e6
+        
+        return ojson({
             "success": True,
             "data": {
                 "query": query,
@@ -322,14 +669,14 @@ def search_memory():
                 "search_time_ms": round(execution_time, 2)
             },
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _iso_now(),
                 "request_id": getattr(request, 'request_id', 'unknown'),
                 "execution_time_ms": round(execution_time, 2)
             }
         })
     except Exception as e:
-        app.logger.error(f"Search error: {e}", exc_info=True)
-        return jsonify({
+        log_error(f"Search error: {e}", e)
+        return ojson({
             "success": False,
             "error": {
                 "code": "INTERNAL_ERROR",
@@ -337,11 +684,197 @@ def search_memory():
                 "details": {"error": str(e)}
             },
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _iso_now(),
                 "request_id": getattr(request, 'request_id', 'unknown'),
                 "execution_time_ms": 0
             }
-        }), 500
+        }, 500)
+
+def _prepare_memory(data):
+    """Build (doc_id, content, metadata) for ChromaDB from an add_memory payload"""
+    content = data['content']
+    
+    # One fresh dict - the caller's 'metadata' object is never modified
+    metadata = {
+        **(data.get('metadata') or {}),
+        'title': data.get('title', 'Untitled Memory'),
+        'session_date': data.get('date') or _iso_now()[:10],
+        'source': data.get('source', 'claude_desktop'),
+        'technologies': _dumps(data.get('technologies', [])),
+        'complexity': data.get('complexity', 'medium'),
+        'project': data.get('project', ''),
+        'indexed_at': _iso_now(),
+        'via_api': True,
+        'conversation_length': len(content),
+        'code_blocks': content.count('```'),
+    }
+    
+    # Stored so the curator can find low-quality memories with a where filter
+    if memory_quality_score:
+        metadata['quality_score'] = memory_quality_score(metadata, content)
+    
+    # Generate unique ID
+    doc_id = data.get('id') or str(uuid.uuid4())
+    
+    return doc_id, content, metadata
+
+def store_memory(data):
+    """Index one memory in the add_memory schema and return (doc_id, title)
+
+    Shared by the HTTP endpoint and the UDP listener. Raises if indexing fails.
+    """
+    doc_id, content, metadata = _prepare_memory(data)
+    
+    # Use ChromaDB collection directly to add the memory
+    COLLECTION.add(
+        documents=[content],
+        metadatas=[metadata],
+        ids=[doc_id]
+    )
+    adjust_count(1)
+    return doc_id, metadata['title']
+
+def store_memories(items):
+    """Index a batch of memories with a single collection.add and return their IDs"""
+    ids, documents, metadatas = [], [], []
+    for data in items:
+        doc_id, content, metadata = _prepare_memory(data)
+        ids.append(doc_id)
+        documents.append(content)
+        metadatas.append(metadata)
+    
+    COLLECTION.add(
+        documents=documents,
+        metadatas=metadatas,
+        ids=ids
+    )
+    adjust_count(len(ids))
+    return ids
+
+# Background add accumulator - add_memory requests are answered right away and
+# indexed in batches, so a burst costs one collection.add instead of one per request
+_ADD_BATCH_SIZE = 100
+_ADD_FLUSH_INTERVAL = 0.25
+_add_queue = queue.Queue(maxsize=1000)
+
+def _flush_adds(batch):
+    """Index one accumulated batch - later duplicates of an ID win
+
+    If the batched add fails, each item is retried on its own so only the
+    items that still fail are lost.
+    """
+    pending = {}
+    for doc_id, content, metadata in batch:
+        pending[doc_id] = (content, metadata)
+    try:
+        COLLECTION.add(
+            documents=[content for content, _ in pending.values()],
+            metadatas=[metadata for _, metadata in pending.values()],
+            ids=list(pending)
+        )
+        adjust_count(len(pending))
+        logger.debug(f"[ADD] Indexed {len(pending)} queued memories")
+        return
+    except Exception as e:
+        if len(pending) == 1:
+            logger.error(f"[ADD] Failed to index queued memory {next(iter(pending))}: {e}", exc_info=True)
+            return
+        logger.warning(f"[ADD] Batch of {len(pending)} failed ({e}) - retrying one by one")
+    
+    # Every request in the batch was already answered 202 - one bad item
+    # (duplicate ID, invalid metadata) must not drop the others
+    added = 0
+    for doc_id, (content, metadata) in pending.items():
+        try:
+            COLLECTION.add(documents=[content], metadatas=[metadata], ids=[doc_id])
+            added += 1
+        except Exception as e:
+            logger.error(f"[ADD] Failed to index queued memory {doc_id}: {e}")
+    if added:
+        adjust_count(added)
+    logger.debug(f"[ADD] Indexed {added} of {len(pending)} queued memories")
+
+def _add_worker():
+    """Drain the add queue - flush every _ADD_BATCH_SIZE items or _ADD_FLUSH_INTERVAL seconds"""
+    while True:
+        item = _add_queue.get()
+        if item is None:
+            return
+        batch = [item]
+        deadline = time.monotonic() + _ADD_FLUSH_INTERVAL
+        stop = False
+        while len(batch) < _ADD_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _add_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                stop = True
+                break
+            batch.append(item)
+        _flush_adds(batch)
+        if stop:
+            return
+
+_add_thread = threading.Thread(target=_add_worker, name='add-memory-batcher', daemon=True)
+_add_thread.start()
+
+def _stop_add_worker():
+    """Flush whatever is still queued before the process exits"""
+    _add_queue.put(None)
+    _add_thread.join(timeout=5)
+
+atexit.register(_stop_add_worker)
+
+def enqueue_memory(data):
+    """Queue one memory for batched indexing and return (doc_id, title)
+
+    Falls back to indexing it in place when the queue is full.
+    """
+    doc_id, content, metadata = _prepare_memory(data)
+    try:
+        _add_queue.put_nowait((doc_id, content, metadata))
+    except queue.Full:
+        COLLECTION.add(documents=[content], metadatas=[metadata], ids=[doc_id])
+        adjust_count(1)
+    return doc_id, metadata['title']
+
+def _udp_listener(sock):
+    """Receive fire-and-forget add_memory / add_memory_batch datagrams from the hooks"""
+    while True:
+        try:
+            payload, _ = sock.recvfrom(65535)
+            data = _loads(payload)
+            if not isinstance(data, dict):
+                logger.warning("[UDP] Dropped datagram that is not a JSON object")
+                continue
+            
+            # Either a single memory or a batch: {"items": [...]}
+            items = data['items'] if 'items' in data else [data]
+            items = [item for item in items if isinstance(item, dict) and 'content' in item]
+            if not items:
+                logger.warning("[UDP] Dropped datagram without 'content'")
+                continue
+            ids = store_memories(items)
+            logger.info(f"[UDP] {len(ids)} memories added")
+        except Exception as e:
+            logger.error(f"[UDP] Failed to add memory: {e}")
+
+def start_udp_listener():
+    """Start the UDP add_memory listener on localhost in a daemon thread"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.bind(('127.0.0.1', UDP_PORT))
+    except OSError as e:
+        sock.close()
+        logger.warning(f"UDP listener not started on port {UDP_PORT}: {e}")
+        return False
+    threading.Thread(target=_udp_listener, args=(sock,), name='udp-add-memory', daemon=True).start()
+    logger.info(f"UDP add_memory listener on 127.0.0.1:{UDP_PORT}")
+    return True
 
 @app.route('/api/add_memory', methods=['POST'])
 @limiter.limit("50 per minute")
@@ -350,167 +883,238 @@ def add_memory():
     try:
         data = request.json
         if not data:
-            return jsonify({
+            return ojson({
                 "success": False,
                 "error": {
                     "code": "VALIDATION_ERROR", 
                     "message": "Request body is required",
                     "details": {}
                 }
-            }), 400
+            }, 400)
         
         # Validate required fields
         required_fields = ['content']
         missing_fields = [field for field in required_fields if field not in data]
         if missing_fields:
-            return jsonify({
+            return ojson({
                 "success": False,
                 "error": {
                     "code": "VALIDATION_ERROR",
                     "message": f"Missing required fields: {missing_fields}",
                     "details": {"missing_fields": missing_fields}
                 }
-            }), 400
-        
-        start_time = datetime.now()
-        
-        # Extract memory data according to execution plan schema
-        memory_data = {
-            "content": data['content'],
-            "title": data.get('title', 'Untitled Memory'),
-            "date": data.get('date', datetime.now().strftime('%Y-%m-%d')),
-            "source": data.get('source', 'claude_desktop'),
-            "technologies": data.get('technologies', []),
-            "file_paths": data.get('file_paths', []),
-            "complexity": data.get('complexity', 'medium'),
-            "project": data.get('project', ''),
-        }
-        
-        # Prepare metadata for ChromaDB
-        metadata = data.get('metadata', {})
-        metadata.update({
-            'title': memory_data['title'],
-            'session_date': memory_data['date'],
-            'source': memory_data['source'],
-            'technologies': json.dumps(memory_data['technologies']),
-            'complexity': memory_data['complexity'],
-            'project': memory_data['project'],
-            'indexed_at': datetime.now().isoformat(),
-            'via_api': True,
-            'conversation_length': len(memory_data['content']),
-            'code_blocks': memory_data['content'].count('```'),
-        })
+            }, 400)
         
-        # Generate unique ID
-        doc_id = data.get('id', str(uuid.uuid4()))
+        start_ns = time.monotonic_ns()
         
-        # Index the content
+        # Queue the content for the batch indexer unless the caller asked to wait (?sync=1)
+        sync = request.args.get('sync', '').lower() in ('1', 'true', 'yes')
         try:
-            # Use ChromaDB collection directly to add the memory
-            indexer.collection.add(
-                documents=[memory_data['content']],
-                metadatas=[metadata],
-                ids=[doc_id]
-            )
-            indexed_id = doc_id
+            if sync:
+                indexed_id, title = store_memory(data)
+            else:
+                indexed_id, title = enqueue_memory(data)
         except Exception as index_error:
-            app.logger.error(f"Indexing error: {index_error}", exc_info=True)
-            return jsonify({
+            log_error(f"Indexing error: {index_error}", index_error)
+            return ojson({
                 "success": False,
                 "error": {
                     "code": "INDEX_ERROR",
                     "message": "Failed to index memory content",
                     "details": {"error": str(index_error)}
                 }
-            }), 500
+            }, 500)
         
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        execution_time = (time.monotonic_ns() - start_ns) / 1e6
         
-        return jsonify({
+        return ojson({
             "success": True,
             "data": {
                 "id": indexed_id,
-                "title": memory_data['title'],
-                "message": "Memory added successfully"
+                "title": title,
+                "message": "Memory added successfully" if sync else "Memory queued for indexing"
             },
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": _iso_now(),
                 "request_id": getattr(request, 'request_id', 'unknown'),
                 "execution_time_ms": round(execution_time, 2)
             }
-        }), 201
+        }, 201 if sync else 202)
         
     except Exception as e:
-        app.logger.error(f"Add memory error: {e}", exc_info=True)
-        return jsonify({
+        log_error(f"Add memory error: {e}", e)
+        return ojson({
             "success": False,
             "error": {
                 "code": "INTERNAL_ERROR",
                 "message": "Failed to add memory",
                 "details": {"error": str(e)}
             }
-        }), 500
+        }, 500)
 
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    """Check API and database health"""
+@app.route('/api/add_memory_batch', methods=['POST'])
+@limiter.limit("20 per minute")
+def add_memory_batch():
+    """Add several memories in one request - body is {"items": [<add_memory payload>, ...]}"""
     try:
-        start_time = datetime.now()
+        data = request.json
+        items = data.get('items') if isinstance(data, dict) else None
+        if not isinstance(items, list) or not items:
+            return ojson({
+                "success": False,
+                "error": {
+                    "code": "VALIDATION_ERROR",
+                    "message": "Request body must contain a non-empty 'items' list",
+                    "details": {}
+                }
+            }, 400)
         
-        # Test database connectivity
-        count = searcher.collection.count()
+        invalid = [i for i, item in enumerate(items) if not isinstance(item, dict) or 'content' not in item]
+        if invalid:
+            return ojson({
+                "success": False,
+                "error": {
+                    "code": "VALIDATION_ERROR",
+                    "message": "Missing required fields: ['content']",
+                    "details": {"invalid_items": invalid}
+                }
+            }, 400)
         
-        # Test search functionality
-        test_search = searcher.search("test", n_results=1)
+        start_ns = time.monotonic_ns()
         
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        try:
+            ids = store_memories(items)
+        except Exception as index_error:
+            log_error(f"Batch indexing error: {index_error}", index_error)
+            return ojson({
+                "success": False,
+                "error": {
+                    "code": "INDEX_ERROR",
+                    "message": "Failed to index memory batch",
+                    "details": {"error": str(index_error)}
+                }
+            }, 500)
         
-        # Get performance statistics
-        perf_stats = get_performance_stats()
+        execution_time = (time.monotonic_ns() - start_ns) / 1e6
         
-        return jsonify({
+        return ojson({
             "success": True,
             "data": {
-                "status": "healthy",
-                "database": {
-                    "connected": True,
-                    "document_count": count,
-                    "path": str(DB_PATH),
-                    "collection": COLLECTION_NAME
-                },
-                "api": {
-                    "version": "1.0",
-                    "endpoints_available": [
-                        "POST /api/search",
-                        "POST /api/add_memory", 
-                        "GET /api/health",
-                        "GET /api/memories",
-                        "DELETE /api/memory/{id}",
-                        "POST /api/reindex"
-                    ]
-                },
-                "performance": {
-                    "health_check_time_ms": round(execution_time, 2),
-                    "search_functional": len(test_search) >= 0,
-                    "uptime_seconds": perf_stats['uptime_seconds'],
-                    "total_requests": perf_stats['request_count'],
-                    "average_response_time_ms": round(perf_stats['average_response_time_ms'], 2)
-                },
-                "system": {
-                    "startup_time": startup_time.isoformat(),
-                    "config_loaded": CONFIG_FILE.exists(),
-                    "log_file": log_file
-                }
+                "ids": ids,
+                "count": len(ids),
+                "message": "Memories added successfully"
             },
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
-                "request_id": getattr(request, 'request_id', str(uuid.uuid4())),
+                "timestamp": _iso_now(),
+                "request_id": getattr(request, 'request_id', 'unknown'),
+                "execution_time_ms": round(execution_time, 2)
+            }
+        }, 201)
+        
+    except Exception as e:
+        log_error(f"Add memory batch error: {e}", e)
+        return ojson({
+            "success": False,
+            "error": {
+                "code": "INTERNAL_ERROR",
+                "message": "Failed to add memories",
+                "details": {"error": str(e)}
+            }
+        }, 500)
+
+# Parts of the /api/health body that never change while the server runs
+_HEALTH_API_INFO = {
+    "version": "1.0",
+    "endpoints_available": [
+        "POST /api/search",
+        "POST /api/add_memory",
+        "POST /api/add_memory_batch",
+        "GET /api/health",
+        "POST /api/session_start",
+        "GET /api/memories",
+        "DELETE /api/memory/{id}",
+        "POST /api/reindex"
+    ]
+}
+_HEALTH_SYSTEM_INFO = {
+    "startup_time": startup_time.isoformat(),
+    "config_loaded": CONFIG_FILE.exists(),
+    "log_file": log_file
+}
+# Health payload is rebuilt at most once per _HEALTH_TTL and shared by every
+# poller (tray, monitors) in between; the lock makes concurrent misses wait for
+# one rebuild instead of each running the test search
+_HEALTH_TTL = 5.0
+_HEALTH_HEADERS = {'Cache-Control': f'max-age={int(_HEALTH_TTL)}, public'}
+_health_lock = threading.Lock()
+_health_cache = {'built_at': float('-inf'), 'data': None}
+
+def _build_health_data():
+    """Run the checks behind /api/health and return its 'data' section"""
+    start_ns = time.monotonic_ns()
+    
+    # Document count (cached) - the test search below still exercises the database
+    count = collection_count()
+    
+    # Test search functionality
+    bounded_search("test", n_results=1)
+    
+    execution_time = (time.monotonic_ns() - start_ns) / 1e6
+    
+    # Get performance statistics
+    perf_stats = get_performance_stats()
+    
+    return {
+        "status": "healthy",
+        "database": {
+            "connected": True,
+            "document_count": count,
+            "path": str(DB_PATH),
+            "collection": COLLECTION_NAME,
+            "indexer_loaded": _indexer is not None
+        },
+        "api": _HEALTH_API_INFO,
+        "performance": {
+            "health_check_time_ms": round(execution_time, 2),
+            "search_functional": True,
+            "uptime_seconds": perf_stats['uptime_seconds'],
+            "total_requests": perf_stats['request_count'],
+            "average_response_time_ms": round(perf_stats['average_response_time_ms'], 2),
+            "searches_in_flight": _search_stats['in_flight'],
+            "searches_waiting": _search_stats['waiting'],
+            "search_concurrency": SEARCH_CONCURRENCY
+        },
+        "system": _HEALTH_SYSTEM_INFO
+    }
+
+@app.route('/api/health', methods=['GET'])
+def health_check():
+    """Check API and database health"""
+    try:
+        start_ns = time.monotonic_ns()
+        
+        with _health_lock:
+            if time.monotonic() - _health_cache['built_at'] > _HEALTH_TTL:
+                _health_cache['data'] = _build_health_data()
+                _health_cache['built_at'] = time.monotonic()
+            data = _health_cache['data']
+        
+        execution_time = (time.monotonic_ns() - start_ns) / 1e6
+        
+        response = ojson({
+            "success": True,
+            "data": data,
+            "metadata": {
+                "timestamp": _iso_now(),
+                "request_id": getattr(request, 'request_id', 'unknown'),
                 "execution_time_ms": round(execution_time, 2)
             }
         })
+        response.headers.update(_HEALTH_HEADERS)
+        return response
     except Exception as e:
-        app.logger.error(f"Health check error: {e}", exc_info=True)
-        return jsonify({
+        log_error(f"Health check error: {e}", e)
+        return ojson({
             "success": False,
             "data": {
                 "status": "unhealthy",
@@ -522,13 +1126,87 @@ def health_check():
                 "message": "System health check failed",
                 "details": {"error": str(e)}
             }
-        }), 503
+        }, 503)
+
+@app.route('/api/session_start', methods=['POST'])
+@limiter.limit("20 per minute")
+def session_start():
+    """Compound session bootstrap - document count, relevant memories and session log in one call"""
+    try:
+        data = request.json or {}
+        start_ns = time.monotonic_ns()
+        
+        project = data.get('project', '')
+        query = data.get('query') or f"{project} recent work session important"
+        max_results = min(data.get('max_results', 5), 10)  # Cap at 10
+        similarity_threshold = data.get('similarity_threshold', 0.4)
+        
+        doc_count = collection_count()
+        
+        results = bounded_search(
+            query=query,
+            n_results=max_results,
+            min_similarity=similarity_threshold
+        ) if doc_count else []
+        
+        memories = [{
+            "id": result['filename'] if 'filename' in result else str(uuid.uuid4()),
+            "title": result.get('title', 'Untitled'),
+            "similarity": result.get('similarity', 0),
+            "preview": result.get('preview', '')[:300]
+        } for result in results]
+        
+        # Log the session start through the add_memory path - a failure here
+        # shouldn't lose the search results
+        session_logged = False
+        try:
+            enqueue_memory({
+                'title': f"Session: {project}",
+                'content': f"New session started at {_iso_now()} in {project}",
+                'source': data.get('source', 'claude_code'),
+                'complexity': 'medium',
+                'project': project
+            })
+            session_logged = True
+        except Exception as index_error:
+            log_error(f"Session log error: {index_error}", index_error)
+        
+        execution_time = (time.monotonic_ns() - start_ns) / 1e6
+        
+        return ojson({
+            "success": True,
+            "data": {
+                "doc_count": doc_count,
+                "memories": memories,
+                "session_logged": session_logged
+            },
+            "metadata": {
+                "timestamp": _iso_now(),
+                "request_id": getattr(request, 'request_id', 'unknown'),
+                "execution_time_ms": round(execution_time, 2)
+            }
+        })
+    except Exception as e:
+        log_error(f"Session start error: {e}", e)
+        return ojson({
+            "success": False,
+            "error": {
+                "code": "INTERNAL_ERROR",
+                "message": "Session start failed",
+                "details": {"error": str(e)}
+            },
+            "metadata": {
+                "timestamp": _iso_now(),
+                "request_id": getattr(request, 'request_id', 'unknown'),
+                "execution_time_ms": 0
+            }
+        }, 500)
 
 @app.route('/api/memories', methods=['GET'])
 def list_memories():
     """List all memories with pagination"""
     try:
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
         
         # Get pagination parameters
         page = int(request.args.get('page', 1))
@@ -536,54 +1214,41 @@ def list_memories():
         offset = (page - 1) * limit
         
         # Get total count
-        total_count = searcher.collection.count()
+        total_count = collection_count()
         
-        # Get memories with pagination
-        try:
-            results = searcher.collection.get(
-                limit=limit,
-                offset=offset,
-                include=["metadatas", "documents"]
-            )
-        except Exception as query_error:
-            # Fallback if offset not supported
-            results = searcher.collection.get(include=["metadatas", "documents"])
-            # Manual pagination
-            if results['ids']:
-                start_idx = min(offset, len(results['ids']))
-                end_idx = min(offset + limit, len(results['ids']))
-                results = {
-                    'ids': results['ids'][start_idx:end_idx],
-                    'metadatas': results['metadatas'][start_idx:end_idx] if results['metadatas'] else [],
-                    'documents': results['documents'][start_idx:end_idx] if results['documents'] else []
-                }
+        # Get memories with pagination - only this page is read from ChromaDB
+        results = COLLECTION.get(
+            limit=limit,
+            offset=offset,
+            include=["metadatas", "documents"]
+        )
         
         # Format memories
         memories = []
-        if results['ids']:
-            for i, doc_id in enumerate(results['ids']):
-                metadata = results['metadatas'][i] if results['metadatas'] else {}
-                document = results['documents'][i] if results['documents'] else ""
-                
-                memories.append({
-                    "id": doc_id,
-                    "title": metadata.get('title', 'Untitled'),
-                    "date": metadata.get('session_date', 'unknown'),
-                    "source": metadata.get('source', 'unknown'),
-                    "complexity": metadata.get('complexity', 'unknown'),
-                    "technologies": json.loads(metadata.get('technologies', '[]')),
-                    "preview": document[:200] + "..." if len(document) > 200 else document,
-                    "metadata": {
-                        "conversation_length": metadata.get('conversation_length', 0),
-                        "code_blocks": metadata.get('code_blocks', 0),
-                        "project": metadata.get('project', ''),
-                        "indexed_at": metadata.get('indexed_at', '')
-                    }
-                })
+        for doc_id, metadata, document in zip(results['ids'], results['metadatas'] or [], results['documents'] or []):
+            metadata = metadata or {}
+            document = document or ""
+            get = metadata.get
+            
+            memories.append({
+                "id": doc_id,
+                "title": get('title', 'Untitled'),
+                "date": get('session_date', 'unknown'),
+                "source": get('source', 'unknown'),
+                "complexity": get('complexity', 'unknown'),
+                "technologies": parse_technologies(get('technologies', '[]')),
+                "preview": f"{document[:200]}..." if len(document) > 200 else document,
+                "metadata": {
+                    "conversation_length": get('conversation_length', 0),
+                    "code_blocks": get('code_blocks', 0),
+                    "project": get('project', ''),
+                    "indexed_at": get('indexed_at', '')
+                }
+            })
         
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        execution_time = (time.monotonic_ns() - start_ns) / 1e6
         
-        return jsonify({
+        return ojson({
             "success": True,
             "data": {
                 "memories": memories,
@@ -597,99 +1262,100 @@ def list_memories():
                 }
             },
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
-                "request_id": getattr(request, 'request_id', str(uuid.uuid4())),
+                "timestamp": _iso_now(),
+                "request_id": getattr(request, 'request_id', 'unknown'),
                 "execution_time_ms": round(execution_time, 2)
             }
         })
     except Exception as e:
-        app.logger.error(f"List memories error: {e}", exc_info=True)
-        return jsonify({
+        log_error(f"List memories error: {e}", e)
+        return ojson({
             "success": False,
             "error": {
                 "code": "INTERNAL_ERROR",
                 "message": "Failed to list memories",
                 "details": {"error": str(e)}
             }
-        }), 500
+        }, 500)
 
 @app.route('/api/memory/<memory_id>', methods=['DELETE'])
 @limiter.limit("30 per minute")
 def delete_memory(memory_id):
     """Delete a specific memory by ID"""
     try:
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
         
         # Check if memory exists first
         try:
-            result = searcher.collection.get(ids=[memory_id])
+            result = COLLECTION.get(ids=[memory_id])
             if not result['ids']:
-                return jsonify({
+                return ojson({
                     "success": False,
                     "error": {
                         "code": "NOT_FOUND",
                         "message": f"Memory with ID '{memory_id}' not found",
                         "details": {}
                     }
-                }), 404
+                }, 404)
         except Exception:
-            return jsonify({
+            return ojson({
                 "success": False,
                 "error": {
                     "code": "NOT_FOUND", 
                     "message": f"Memory with ID '{memory_id}' not found",
                     "details": {}
                 }
-            }), 404
+            }, 404)
         
         # Delete the memory
-        searcher.collection.delete(ids=[memory_id])
+        COLLECTION.delete(ids=[memory_id])
+        adjust_count(-1)
         
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        execution_time = (time.monotonic_ns() - start_ns) / 1e6
         
-        return jsonify({
+        return ojson({
             "success": True,
             "data": {
                 "message": f"Memory '{memory_id}' deleted successfully"
             },
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
-                "request_id": getattr(request, 'request_id', str(uuid.uuid4())),
+                "timestamp": _iso_now(),
+                "request_id": getattr(request, 'request_id', 'unknown'),
                 "execution_time_ms": round(execution_time, 2)
             }
         })
     except Exception as e:
-        app.logger.error(f"Delete memory error: {e}", exc_info=True)
-        return jsonify({
+        log_error(f"Delete memory error: {e}", e)
+        return ojson({
             "success": False,
             "error": {
                 "code": "INTERNAL_ERROR",
                 "message": "Failed to delete memory",
                 "details": {"error": str(e)}
             }
-        }), 500
+        }, 500)
 
 @app.route('/api/reindex', methods=['POST'])
 @limiter.limit("5 per hour")
 def reindex_database():
     """Rebuild the entire index"""
     try:
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
         
         # Get admin confirmation
         data = request.json or {}
         if not data.get('confirm', False):
-            return jsonify({
+            return ojson({
                 "success": False,
                 "error": {
                     "code": "CONFIRMATION_REQUIRED",
                     "message": "Reindexing requires confirmation. Send {\"confirm\": true}",
                     "details": {}
                 }
-            }), 400
+            }, 400)
         
         # Get current count before reindex
-        old_count = searcher.collection.count()
+        old_count = refresh_count()
         
         # Perform reindex (this would typically involve re-reading source files)
         app.logger.info("Starting database reindex operation")
@@ -698,9 +1364,9 @@ def reindex_database():
         # based on your specific indexing strategy
         new_count = old_count  # For now, just return current count
         
-        execution_time = (datetime.now() - start_time).total_seconds() * 1000
+        execution_time = (time.monotonic_ns() - start_ns) / 1e6
         
-        return jsonify({
+        return ojson({
             "success": True,
             "data": {
                 "message": "Reindex completed successfully",
@@ -711,21 +1377,51 @@ def reindex_database():
                 }
             },
             "metadata": {
-                "timestamp": datetime.now().isoformat(),
-                "request_id": getattr(request, 'request_id', str(uuid.uuid4())),
+                "timestamp": _iso_now(),
+                "request_id": getattr(request, 'request_id', 'unknown'),
                 "execution_time_ms": round(execution_time, 2)
             }
         })
     except Exception as e:
-        app.logger.error(f"Reindex error: {e}", exc_info=True)
-        return jsonify({
+        log_error(f"Reindex error: {e}", e)
+        return ojson({
             "success": False,
             "error": {
                 "code": "REINDEX_FAILED",
                 "message": "Database reindex failed",
                 "details": {"error": str(e)}
             }
-        }), 500
+        }, 500)
+
+def serve_app():
+    """Run the app with the server settings from config.json
+
+    Used by __main__ and by the Windows service wrapper, so the server is tuned
+    the same way however it is started.
+    """
+    if DEBUG_MODE:
+        # Reloader and debugger need the development server
+        app.run(host=API_HOST, port=API_PORT, debug=True)
+        return
+    
+    try:
+        from waitress import serve
+    except ImportError:
+        logger.warning("Waitress not installed - using Flask's threaded development server")
+        app.run(host=API_HOST, port=API_PORT, debug=False, threaded=True)
+        return
+    
+    # Worker threads let ChromaDB calls from concurrent clients overlap
+    print(f"Serving with Waitress ({WORKER_THREADS} threads)")
+    serve(
+        app,
+        host=API_HOST,
+        port=API_PORT,
+        threads=WORKER_THREADS,
+        connection_limit=MAX_CONNECTIONS,
+        channel_timeout=30,
+        asyncore_use_poll=True
+    )
 
 if __name__ == '__main__':
     print("Starting Claude Memory API Server...")
@@ -733,7 +1429,9 @@ if __name__ == '__main__':
     print("Available Endpoints:")
     print("   - POST /api/search           - Search for similar content")
     print("   - POST /api/add_memory       - Add new memory to database")
+    print("   - POST /api/add_memory_batch - Add several memories in one request")
     print("   - GET  /api/health           - Check system health & status")
+    print("   - POST /api/session_start    - Session bootstrap (count + memories + log)")
     print("   - GET  /api/memories         - List all memories (paginated)")
     print("   - DELETE /api/memory/<id>    - Delete specific memory by ID")
     print("   - POST /api/reindex          - Rebuild entire search index")
@@ -743,7 +1441,14 @@ if __name__ == '__main__':
         try:
             # Try to detect project root from environment or config
             project_root = os.environ.get('CLAUDE_PROJECT_ROOT', os.getcwd())
-            initialize_active_memory(app, searcher, project_root)
+            active_config = config.get("active_memory", {})
+            initialize_active_memory(
+                app, searcher, project_root,
+                check_interval=active_config.get("file_check_interval_seconds", 5),
+                log_poll_interval=active_config.get("log_poll_interval_seconds", 2),
+                observer_timeout=active_config.get("observer_timeout_seconds", 1),
+                search=bounded_search
+            )
             print("\n[OK] Active Memory Features Enabled:")
             print("   - GET  /api/active/status        - Get active memory status")
             print("   - GET  /api/active/decisions     - Get pending warnings/decisions")
@@ -757,7 +1462,7 @@ if __name__ == '__main__':
     # Initialize curation API if available
     if CURATION_API_AVAILABLE:
         try:
-            initialize_curation_api(app, searcher, indexer)
+            initialize_curation_api(app, searcher, LazyIndexer())
             print("\n[OK] Memory Curation Features Enabled:")
             print("   - GET  /api/curator/health       - Analyze memory health")
             print("   - POST /api/curator/deduplicate  - Remove duplicate memories")
@@ -782,8 +1487,11 @@ if __name__ == '__main__':
     print(f"   - Collection: {COLLECTION_NAME}")
     print("\nStarting server with CORS enabled for web interface...")
     
+    if start_udp_listener():
+        print(f"Fire-and-forget add_memory listening on udp://127.0.0.1:{UDP_PORT}")
+    
     try:
-        app.run(host=API_HOST, port=API_PORT, debug=DEBUG_MODE)
+        serve_app()
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
@@ -21,6 +21,7 @@ import threading
 import time
 import subprocess
 import requests
+from requests.adapters import HTTPAdapter
 import json
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -54,14 +55,29 @@ class MemoryAPITrayApp:
         self.last_health_check = None
         self.tray_icon = None
         
+        # Set to wake the health monitor immediately on stop/quit
+        self._stop_event = threading.Event()
+        
         # Configuration
         self.host = "localhost"
         self.port = 8080
         self.api_url = f"http://{self.host}:{self.port}"
         
+        # Paths are resolved once - the tray never changes directory
+        self._cwd = Path.cwd()
+        self._server_script = self._cwd / "memory_api_server.py"
+        self._venv_python = self._cwd / "venv" / "Scripts" / "python.exe"
+        
+        # One keep-alive connection reused by every health probe
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=1))
+        
         # Setup logging
         self.setup_logging()
         
+        # The icon only ever takes one of four colors - draw each once
+        self._icons = {color: self.create_icon_image(color) for color in ("green", "red", "yellow", "gray")}
+        
         # Hide console window on Windows
         if sys.platform == "win32":
             self.hide_console()
@@ -70,12 +86,14 @@ class MemoryAPITrayApp:
         """Setup logging configuration"""
         log_dir = Path("logs")
         log_dir.mkdir(exist_ok=True)
+        self.tray_log = log_dir / "tray_app.log"
+        self.server_output_log = log_dir / "server.out"
         
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(levelname)s - %(message)s',
             handlers=[
-                logging.FileHandler(log_dir / "tray_app.log"),
+                logging.FileHandler(self.tray_log),
                 logging.StreamHandler(sys.stdout)
             ]
         )
@@ -133,8 +151,9 @@ class MemoryAPITrayApp:
         }
         
         color = color_map.get(status.lower(), "gray")
-        new_icon = self.create_icon_image(color)
-        self.tray_icon.icon = new_icon
+        new_icon = self._icons[color]
+        if self.tray_icon.icon is not new_icon:
+            self.tray_icon.icon = new_icon
         
         # Update tooltip
         tooltip_text = f"Claude Memory API - {status.title()}"
@@ -158,7 +177,7 @@ class MemoryAPITrayApp:
     def check_prerequisites(self) -> bool:
         """Check if all prerequisites are met"""
         # Check if we're in the right directory
-        if not Path("memory_api_server.py").exists():
+        if not self._server_script.exists():
             self.show_notification(
                 "Setup Error", 
                 "memory_api_server.py not found in current directory"
@@ -166,7 +185,7 @@ class MemoryAPITrayApp:
             return False
         
         # Check virtual environment
-        if not Path("venv/Scripts/python.exe").exists():
+        if not self._venv_python.exists():
             self.show_notification(
                 "Setup Error",
                 "Virtual environment not found. Please run setup first."
@@ -186,13 +205,15 @@ class MemoryAPITrayApp:
         
         self.logger.info("Starting Claude Memory API server...")
         self.update_icon_status("starting")
+        self._stop_event.clear()
         
         try:
             # Prepare environment
             env = os.environ.copy()
             env['FLASK_ENV'] = 'production'
             env['FLASK_DEBUG'] = '0'
-            env['PYTHONPATH'] = str(Path.cwd())
+            env['PYTHONPATH'] = str(self._cwd)
+            env['PYTHONIOENCODING'] = 'utf-8'  # server.out is written as raw UTF-8 bytes
             
             # Start server process (hidden)
             startupinfo = None
@@ -201,57 +222,28 @@ class MemoryAPITrayApp:
                 startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
                 startupinfo.wShowWindow = subprocess.SW_HIDE
             
-            # Use the virtual environment's Python directly
-            venv_python = Path.cwd() / "venv" / "Scripts" / "python.exe"
-            if not venv_python.exists():
-                self.logger.error(f"Virtual environment Python not found: {venv_python}")
-                self.show_notification("Error", "Virtual environment Python not found")
-                return
+            # Start server using venv Python directly (checked by check_prerequisites)
+            cmd = [str(self._venv_python), str(self._server_script)]
             
-            # Start server using venv Python directly
-            cmd = [str(venv_python), "memory_api_server.py"]
-            
-            self.server_process = subprocess.Popen(
-                cmd,
-                env=env,
-                startupinfo=startupinfo,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
-                cwd=str(Path.cwd()),  # Ensure correct working directory
-                encoding='utf-8',  # Handle Unicode output
-                errors='replace'  # Replace undecodable characters
-            )
+            # The server writes its console output straight to logs/server.out -
+            # no pipes, so no reader threads in the tray
+            with open(self.server_output_log, 'ab', buffering=0) as server_output:
+                self.server_process = subprocess.Popen(
+                    cmd,
+                    env=env,
+                    startupinfo=startupinfo,
+                    stdin=subprocess.DEVNULL,
+                    stdout=server_output,
+                    stderr=subprocess.STDOUT,
+                    creationflags=subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0,
+                    cwd=str(self._cwd)  # Ensure correct working directory
+                )
             
             self.is_running = True
             
             # Start health monitoring
             self.start_health_monitoring()
             
-            # Monitor server output in background
-            def monitor_output():
-                try:
-                    for line in iter(self.server_process.stdout.readline, ''):
-                        if line:
-                            self.logger.info(f"Server output: {line.strip()}")
-                except Exception as e:
-                    self.logger.error(f"Error monitoring server output: {e}")
-            
-            output_thread = threading.Thread(target=monitor_output, daemon=True)
-            output_thread.start()
-            
-            # Monitor server errors in background
-            def monitor_errors():
-                try:
-                    for line in iter(self.server_process.stderr.readline, ''):
-                        if line:
-                            self.logger.error(f"Server error: {line.strip()}")
-                except Exception as e:
-                    self.logger.error(f"Error monitoring server errors: {e}")
-            
-            error_thread = threading.Thread(target=monitor_errors, daemon=True)
-            error_thread.start()
-            
             # Wait a moment then check if server started
             time.sleep(5)  # Give more time to start
             if self.check_server_health():
@@ -291,6 +283,7 @@ class MemoryAPITrayApp:
         
         self.logger.info("Stopping Claude Memory API server...")
         self.update_icon_status("stopping")
+        self._stop_event.set()
         
         try:
             if self.server_process:
@@ -317,7 +310,7 @@ class MemoryAPITrayApp:
     def check_server_health(self) -> bool:
         """Check if server is healthy"""
         try:
-            response = requests.get(f"{self.api_url}/api/health", timeout=5)
+            response = self._session.get(f"{self.api_url}/api/health", timeout=5)
             if response.status_code == 200:
                 data = response.json()
                 if data.get("success"):
@@ -343,7 +336,8 @@ class MemoryAPITrayApp:
                     self.update_icon_status("running")
                 else:
                     self.update_icon_status("error")
-                time.sleep(30)  # Check every 30 seconds
+                if self._stop_event.wait(30):  # Check every 30 seconds
+                    break
         
         if not self.server_thread or not self.server_thread.is_alive():
             self.server_thread = threading.Thread(target=monitor, daemon=True)
@@ -369,10 +363,10 @@ Process ID: {self.server_process.pid if self.server_process else 'None'}
         self.show_notification("Status", status_info, timeout=10)
         self.logger.info(f"Status requested: {status_info.replace(chr(10), ' | ')}")
     
-    def view_logs(self):
+    def view_logs(self, log_file: Optional[Path] = None):
         """Open log file in default text editor"""
         try:
-            log_file = Path("logs/tray_app.log")
+            log_file = log_file or self.tray_log
             if log_file.exists():
                 if sys.platform == "win32":
                     os.startfile(log_file)
@@ -408,7 +402,8 @@ Process ID: {self.server_process.pid if self.server_process else 'None'}
                 enabled=lambda item: self.is_running
             ),
             pystray.Menu.SEPARATOR,
-            item("View Logs", self.view_logs),
+            item("View Logs", lambda: self.view_logs()),
+            item("View Server Output", lambda: self.view_logs(self.server_output_log)),
             pystray.Menu.SEPARATOR,
             item("Quit", self.quit_application)
         )
@@ -416,11 +411,14 @@ Process ID: {self.server_process.pid if self.server_process else 'None'}
     def quit_application(self):
         """Quit the tray application"""
         self.logger.info("Shutting down tray application...")
+        self._stop_event.set()
         
         # Stop server if running
         if self.is_running:
             self.stop_server()
         
+        self._session.close()
+        
         # Stop tray icon
         if self.tray_icon:
             self.tray_icon.stop()
@@ -432,7 +430,7 @@ Process ID: {self.server_process.pid if self.server_process else 'None'}
         self.logger.info("Starting Claude Memory API Tray Application...")
         
         # Create system tray icon
-        icon_image = self.create_icon_image("gray")
+        icon_image = self._icons["gray"]
         self.tray_icon = pystray.Icon(
             "claude_memory_api",
             icon_image,
@@ -4,8 +4,11 @@ Adds memory management and curation features to the memory server
 """
 
 from flask import Blueprint, jsonify, request
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import atexit
 import logging
+import time
 
 # Import the curator
 from memory_curator import MemoryCurator
@@ -19,6 +22,9 @@ logger = logging.getLogger('memory_api.curation')
 # Global curator instance (will be initialized by main server)
 curator = None
 
+# Worker pool for curator fan-out, created once and shared by every request
+curator_pool = None
+
 @curation_api.route('/api/curator/health', methods=['GET'])
 def get_memory_health():
     """Get comprehensive memory health analysis"""
@@ -29,9 +35,9 @@ def get_memory_health():
                 'error': 'Curator not initialized'
             }), 500
         
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         health_report = curator.analyze_memory_health()
-        execution_time = (datetime.now() - start_time).total_seconds()
+        execution_time = time.perf_counter() - start_time
         
         return jsonify({
             'success': True,
@@ -145,45 +151,57 @@ def enhance_memory(memory_id):
             'error': str(e)
         }), 500
 
+@curation_api.route('/api/curator/score-quality', methods=['POST'])
+def score_quality():
+    """Store quality scores on memories indexed without one"""
+    try:
+        data = request.json or {}
+        dry_run = data.get('dry_run', True)
+        
+        found = curator.backfill_quality_scores(dry_run=dry_run)
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'found': found,
+                'scored': 0 if dry_run else found,
+                'dry_run': dry_run
+            },
+            'metadata': {
+                'timestamp': datetime.now().isoformat()
+            }
+        })
+    except Exception as e:
+        logger.error(f"Quality scoring failed: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @curation_api.route('/api/curator/analyze', methods=['GET'])
 def analyze_patterns():
     """Analyze patterns and insights from memories"""
     try:
-        # Get all memories for analysis
-        results = curator.searcher.collection.get(include=["metadatas", "documents"])
+        # One paged pass over the collection - no full materialization
+        insights = curator.analyze_patterns()
         
-        if not results['ids']:
+        if not insights['total_memories']:
             return jsonify({
                 'success': True,
                 'data': {'message': 'No memories to analyze'},
             })
         
-        memories = []
-        for i, doc_id in enumerate(results['ids']):
-            metadata = results['metadatas'][i] if results['metadatas'] else {}
-            content = results['documents'][i] if results['documents'] else ''
-            memories.append({
-                'id': doc_id,
-                'metadata': metadata,
-                'content': content
-            })
-        
-        # Analyze patterns
-        insights = {
-            'total_memories': len(memories),
-            'error_patterns': curator._analyze_error_patterns(memories),
-            'technology_trends': curator._get_technology_distribution(memories),
-            'quality_metrics': curator._assess_quality_distribution(memories),
-            'temporal_patterns': curator._get_age_distribution(memories),
-            'consolidation_opportunities': len(curator._find_consolidation_opportunities(memories))
-        }
+        insights['consolidation_opportunities'] = len(insights['consolidation_opportunities'])
         
         # Generate insights
-        if insights['error_patterns']['common_patterns']:
+        common_patterns = insights['error_patterns'].get('common_patterns')
+        if common_patterns:
+            top_tech = next(iter(insights['technology_trends']), 'None')
+            qm = insights['quality_metrics']
             insights['key_insights'] = [
-                f"Found {len(insights['error_patterns']['common_patterns'])} recurring error patterns",
-                f"Most common technology: {list(insights['technology_trends'].keys())[0] if insights['technology_trends'] else 'None'}",
-                f"Memory quality: {insights['quality_metrics']['high']} high, {insights['quality_metrics']['medium']} medium, {insights['quality_metrics']['low']} low"
+                f"Found {len(common_patterns)} recurring error patterns",
+                f"Most common technology: {top_tech}",
+                f"Memory quality: {qm['high']} high, {qm['medium']} medium, {qm['low']} low"
             ]
         else:
             insights['key_insights'] = []
@@ -211,35 +229,35 @@ def auto_curate():
         
         actions_taken = []
         
-        # 1. Remove duplicates
-        dedup_result = curator.deduplicate_memories(dry_run=dry_run)
+        # 1. Remove duplicates, 2. archive old memories (>180 days) and
+        # 3. find low-quality memories by their stored quality score
+        if dry_run:
+            # All three are read-only scans - overlap them on the shared pool
+            dedup_future = curator_pool.submit(curator.deduplicate_memories, dry_run=True)
+            archive_future = curator_pool.submit(curator.archive_old_memories, 180, dry_run=True)
+            low_quality_future = curator_pool.submit(curator.list_low_quality_ids, 20)  # Limit to 20 for performance
+            dedup_result = dedup_future.result()
+            archive_result = archive_future.result()
+            low_quality_ids = low_quality_future.result()
+        else:
+            # Each step deletes or updates rows the next one reads - keep them in order
+            dedup_result = curator.deduplicate_memories(dry_run=False)
+            archive_result = curator.archive_old_memories(180, dry_run=False)
+            low_quality_ids = curator.list_low_quality_ids(20)
+        
         if dedup_result['duplicates_found'] > 0:
             actions_taken.append(f"{'Would remove' if dry_run else 'Removed'} {dedup_result['duplicates_found']} duplicates")
         
-        # 2. Archive old memories (>180 days)
-        archive_result = curator.archive_old_memories(180, dry_run=dry_run)
         if archive_result['found'] > 0:
             actions_taken.append(f"{'Would archive' if dry_run else 'Archived'} {archive_result['found']} old memories")
         
-        # 3. Enhance low-quality memories
-        results = curator.searcher.collection.get(include=["metadatas"])
         enhanced_count = 0
         
-        if results['ids']:
-            for i, doc_id in enumerate(results['ids'][:20]):  # Limit to 20 for performance
-                memory = {
-                    'id': doc_id,
-                    'metadata': results['metadatas'][i] if results['metadatas'] else {},
-                    'content': ''
-                }
-                
-                quality_score = curator._calculate_memory_quality_score(memory)
-                if quality_score < 0.5 and not dry_run:
-                    try:
-                        curator.enhance_memory_quality(doc_id)
-                        enhanced_count += 1
-                    except:
-                        pass
+        if dry_run:
+            enhanced_count = len(low_quality_ids)
+        else:
+            # One ChromaDB get and one update for the whole batch
+            enhanced_count = curator.enhance_memories_bulk(low_quality_ids)
         
         if enhanced_count > 0 or (dry_run and enhanced_count == 0):
             actions_taken.append(f"{'Would enhance' if dry_run else 'Enhanced'} {enhanced_count} low-quality memories")
@@ -264,11 +282,16 @@ def auto_curate():
 
 def initialize_curation_api(app, searcher, indexer):
     """Initialize the curation API with dependencies"""
-    global curator
+    global curator, curator_pool
     
     # Initialize curator
     curator = MemoryCurator(searcher, indexer)
     
+    # One pool for the life of the server rather than one per request
+    if curator_pool is None:
+        curator_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix='curator')
+        atexit.register(curator_pool.shutdown)
+    
     # Register blueprint
     app.register_blueprint(curation_api)
     
@@ -19,6 +19,208 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('memory_curator')
 
+def memory_quality_score(metadata: Dict, content: str) -> float:
+    """Quality score in [0, 1] for a memory's metadata and content
+
+    Stored as the 'quality_score' metadata field so low-quality memories can be
+    found with a ChromaDB where filter instead of scoring every row.
+    """
+    score = 0.0
+    
+    # Content length (longer is generally better)
+    if len(content) > 500:
+        score += 0.2
+    elif len(content) > 200:
+        score += 0.1
+    
+    # Has title
+    if metadata.get('title') and metadata.get('title') != 'Untitled':
+        score += 0.2
+    
+    # Has technologies
+    if metadata.get('technologies'):
+        score += 0.15
+    
+    # Has complexity rating
+    if metadata.get('complexity'):
+        score += 0.1
+    
+    # Has date
+    if metadata.get('date') or metadata.get('session_date'):
+        score += 0.1
+    
+    # Has source
+    if metadata.get('source'):
+        score += 0.1
+    
+    # Contains code blocks (valuable for technical memories)
+    if '```' in content:
+        score += 0.15
+    
+    return min(score, 1.0)
+
+class _ErrorPatternStats:
+    """Error-memory counts and sample messages, fed one memory at a time"""
+    
+    TERMS = ('error', 'failed', 'exception', 'bug', 'issue')
+    
+    def __init__(self, curator):
+        self.curator = curator
+        self.total = 0
+        self.error_count = 0
+        self.error_types = defaultdict(int)
+        self.error_messages = []
+    
+    def add(self, memory: Dict):
+        self.total += 1
+        content = memory.get('content', '')
+        content_lower = content.lower()
+        
+        # Check if this is an error-related memory
+        if not any(term in content_lower for term in self.TERMS):
+            return
+        self.error_count += 1
+        
+        # Categorize error type
+        if 'typeerror' in content_lower:
+            self.error_types['TypeError'] += 1
+        elif 'syntaxerror' in content_lower:
+            self.error_types['SyntaxError'] += 1
+        elif 'null' in content_lower or 'undefined' in content_lower:
+            self.error_types['NullReference'] += 1
+        elif 'import' in content_lower or 'module' in content_lower:
+            self.error_types['ImportError'] += 1
+        else:
+            self.error_types['Other'] += 1
+        
+        # Try to extract an error message from the first 50 error memories
+        if self.error_count <= 50:
+            error_match = re.search(r'error[:\s]+([^\n]{20,100})', content, re.IGNORECASE)
+            if error_match:
+                self.error_messages.append(error_match.group(1))
+    
+    def result(self) -> Dict[str, Any]:
+        common_patterns = self.curator._find_common_patterns(self.error_messages) if self.error_messages else []
+        return {
+            'total_error_memories': self.error_count,
+            'error_types': dict(self.error_types),
+            'common_patterns': common_patterns[:5],
+            'error_rate': self.error_count / self.total if self.total else 0
+        }
+
+class _TechnologyStats:
+    """Technology mention counts, fed one memory at a time"""
+    
+    def __init__(self):
+        self.tech_count = defaultdict(int)
+    
+    def add(self, memory: Dict):
+        tech_str = memory.get('metadata', {}).get('technologies', '[]')
+        try:
+            technologies = json.loads(tech_str) if isinstance(tech_str, str) else tech_str
+            for tech in technologies:
+                self.tech_count[tech] += 1
+        except:
+            pass
+    
+    def result(self) -> Dict[str, int]:
+        # Top 10 by count
+        return dict(sorted(self.tech_count.items(), key=lambda x: x[1], reverse=True)[:10])
+
+class _QualityStats:
+    """High/medium/low quality counts, fed one memory at a time"""
+    
+    def __init__(self, curator):
+        self.curator = curator
+        self.quality_dist = {'high': 0, 'medium': 0, 'low': 0}
+    
+    def add(self, memory: Dict):
+        score = self.curator._calculate_memory_quality_score(memory)
+        thresholds = self.curator.quality_thresholds
+        if score >= thresholds['high']:
+            self.quality_dist['high'] += 1
+        elif score >= thresholds['medium']:
+            self.quality_dist['medium'] += 1
+        else:
+            self.quality_dist['low'] += 1
+    
+    def result(self) -> Dict[str, int]:
+        return self.quality_dist
+
+class _ConsolidationStats:
+    """Title and date groups of memories that could be consolidated, fed one memory at a time
+    
+    Only the count, the first 5 IDs and a sample title are kept per group.
+    """
+    
+    def __init__(self):
+        self.title_groups = {}
+        self.date_groups = {}
+    
+    @staticmethod
+    def _add_to_group(groups, key, memory, sample=None):
+        group = groups.setdefault(key, [0, [], sample])
+        group[0] += 1
+        if len(group[1]) < 5:
+            group[1].append(memory['id'])
+    
+    def add(self, memory: Dict):
+        metadata = memory.get('metadata', {})
+        
+        # Group by title similarity
+        title = metadata.get('title', '')
+        if title and title != 'Untitled':
+            # Normalize title for grouping
+            title_key = re.sub(r'[^a-z0-9]+', '', title.lower())[:20]
+            self._add_to_group(self.title_groups, title_key, memory, title)
+        
+        # Group by day
+        date = metadata.get('date') or metadata.get('session_date')
+        if date:
+            self._add_to_group(self.date_groups, date[:10], memory)
+    
+    def result(self) -> List[Dict]:
+        opportunities = []
+        for count, ids, sample in self.title_groups.values():
+            if count > 2:
+                opportunities.append({'type': 'similar_title', 'count': count, 'sample': sample, 'memory_ids': ids})
+        for date, (count, ids, _) in self.date_groups.items():
+            if count > 3:
+                opportunities.append({'type': 'same_date', 'date': date, 'count': count, 'memory_ids': ids})
+        return opportunities[:10]  # Return top 10 opportunities
+
+class _AgeStats:
+    """Memory age buckets, fed one memory at a time"""
+    
+    def __init__(self):
+        self.now = datetime.now()
+        self.age_dist = {'today': 0, 'this_week': 0, 'this_month': 0, 'this_quarter': 0, 'older': 0}
+    
+    def add(self, memory: Dict):
+        metadata = memory.get('metadata', {})
+        date_str = metadata.get('date') or metadata.get('session_date')
+        if not date_str:
+            return
+        try:
+            memory_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+            age_days = (self.now - memory_date).days
+            
+            if age_days == 0:
+                self.age_dist['today'] += 1
+            elif age_days <= 7:
+                self.age_dist['this_week'] += 1
+            elif age_days <= 30:
+                self.age_dist['this_month'] += 1
+            elif age_days <= 90:
+                self.age_dist['this_quarter'] += 1
+            else:
+                self.age_dist['older'] += 1
+        except:
+            pass
+    
+    def result(self) -> Dict[str, int]:
+        return self.age_dist
+
 class MemoryCurator:
     """Manages the quality and lifecycle of memories"""
     
@@ -72,6 +274,107 @@ class MemoryCurator:
             logger.error(f"Error analyzing memory health: {e}")
             return {'status': 'error', 'error': str(e)}
     
+    def iter_memories(self, page_size: int = 1000, include: List[str] = None):
+        """Yield (id, metadata, document) from the collection one page at a time"""
+        include = include or ["metadatas", "documents"]
+        offset = 0
+        while True:
+            results = self.searcher.collection.get(include=include, limit=page_size, offset=offset)
+            ids = results['ids']
+            metadatas = results.get('metadatas') or [None] * len(ids)
+            documents = results.get('documents') or [None] * len(ids)
+            for doc_id, metadata, document in zip(ids, metadatas, documents):
+                yield doc_id, metadata or {}, document or ''
+            if len(ids) < page_size:
+                break
+            offset += page_size
+    
+    def analyze_patterns(self, page_size: int = 1000) -> Dict[str, Any]:
+        """Pattern insights over the whole collection in one paged pass
+        
+        Feeds every memory to the same accumulators behind _analyze_error_patterns,
+        _get_technology_distribution, _assess_quality_distribution,
+        _get_age_distribution and _find_consolidation_opportunities, so only one
+        page of memories is held at a time and each memory is visited once.
+        """
+        accumulators = {
+            'error_patterns': _ErrorPatternStats(self),
+            'technology_trends': _TechnologyStats(),
+            'quality_metrics': _QualityStats(self),
+            'temporal_patterns': _AgeStats(),
+            'consolidation_opportunities': _ConsolidationStats()
+        }
+        
+        total = 0
+        for doc_id, metadata, content in self.iter_memories(page_size):
+            total += 1
+            memory = {'id': doc_id, 'metadata': metadata, 'content': content}
+            for accumulator in accumulators.values():
+                accumulator.add(memory)
+        
+        insights = {'total_memories': total}
+        for key, accumulator in accumulators.items():
+            insights[key] = accumulator.result()
+        return insights
+    
+    def backfill_quality_scores(self, page_size: int = 500, dry_run: bool = False) -> int:
+        """Store 'quality_score' on memories indexed without one; returns how many lack it
+        
+        A one-off migration for memories indexed outside the API. Only the
+        metadata is scanned - documents are fetched just for the unscored IDs.
+        """
+        missing = [
+            doc_id
+            for doc_id, metadata, _ in self.iter_memories(page_size, include=["metadatas"])
+            if 'quality_score' not in metadata
+        ]
+        if dry_run or not missing:
+            return len(missing)
+        
+        for start in range(0, len(missing), page_size):
+            results = self.searcher.collection.get(
+                ids=missing[start:start + page_size],
+                include=["metadatas", "documents"]
+            )
+            metadatas = [
+                dict(metadata or {}, quality_score=memory_quality_score(metadata or {}, content or ''))
+                for metadata, content in zip(results['metadatas'], results['documents'])
+            ]
+            self.searcher.collection.update(ids=results['ids'], metadatas=metadatas)
+        
+        logger.info(f"Stored quality scores for {len(missing)} memories")
+        return len(missing)
+    
+    def list_low_quality_ids(self, limit: int = 20, threshold: float = None) -> List[str]:
+        """IDs of up to `limit` memories whose stored quality score is below threshold
+        
+        Read-only. Memories already enhanced are skipped - enhancement can't
+        raise their score any further. Memories without a stored score are
+        not found until backfill_quality_scores() has run.
+        """
+        if threshold is None:
+            threshold = self.quality_thresholds['medium']
+        
+        ids = []
+        page_size = max(limit * 2, 50)
+        offset = 0
+        while len(ids) < limit:
+            results = self.searcher.collection.get(
+                where={'quality_score': {'$lt': threshold}},
+                limit=page_size,
+                offset=offset,
+                include=["metadatas"]
+            )
+            ids.extend(
+                doc_id
+                for doc_id, metadata in zip(results['ids'], results['metadatas'])
+                if not (metadata or {}).get('enhanced_at')
+            )
+            if len(results['ids']) < page_size:
+                break
+            offset += page_size
+        return ids[:limit]
+    
     def _find_duplicates(self, memories: List[Dict]) -> Dict[str, Any]:
         """Find duplicate or near-duplicate memories"""
         duplicates = []
@@ -146,53 +449,15 @@ class MemoryCurator:
         
         return stale[:20]  # Return top 20 stale memories
     
+    def _accumulate(self, memories, accumulator):
+        """Feed memories to one of the single-pass accumulators and return its result"""
+        for memory in memories:
+            accumulator.add(memory)
+        return accumulator.result()
+    
     def _analyze_error_patterns(self, memories: List[Dict]) -> Dict[str, Any]:
         """Analyze error patterns in memories"""
-        error_memories = []
-        error_types = defaultdict(int)
-        
-        for memory in memories:
-            content = memory.get('content', '').lower()
-            metadata = memory.get('metadata', {})
-            
-            # Check if this is an error-related memory
-            if any(term in content for term in ['error', 'failed', 'exception', 'bug', 'issue']):
-                error_memories.append(memory)
-                
-                # Categorize error type
-                if 'typeerror' in content:
-                    error_types['TypeError'] += 1
-                elif 'syntaxerror' in content:
-                    error_types['SyntaxError'] += 1
-                elif 'null' in content or 'undefined' in content:
-                    error_types['NullReference'] += 1
-                elif 'import' in content or 'module' in content:
-                    error_types['ImportError'] += 1
-                else:
-                    error_types['Other'] += 1
-        
-        # Find most common error patterns
-        common_patterns = []
-        if error_memories:
-            # Extract error messages
-            error_messages = []
-            for mem in error_memories[:50]:  # Analyze top 50
-                content = mem.get('content', '')
-                # Try to extract error message
-                error_match = re.search(r'error[:\s]+([^\n]{20,100})', content, re.IGNORECASE)
-                if error_match:
-                    error_messages.append(error_match.group(1))
-            
-            # Find common substrings
-            if error_messages:
-                common_patterns = self._find_common_patterns(error_messages)
-        
-        return {
-            'total_error_memories': len(error_memories),
-            'error_types': dict(error_types),
-            'common_patterns': common_patterns[:5],
-            'error_rate': len(error_memories) / len(memories) if memories else 0
-        }
+        return self._accumulate(memories, _ErrorPatternStats(self))
     
     def _find_common_patterns(self, messages: List[str]) -> List[str]:
         """Find common patterns in error messages"""
@@ -215,161 +480,23 @@ class MemoryCurator:
     
     def _get_technology_distribution(self, memories: List[Dict]) -> Dict[str, int]:
         """Get distribution of technologies mentioned in memories"""
-        tech_count = defaultdict(int)
-        
-        for memory in memories:
-            metadata = memory.get('metadata', {})
-            
-            # Check technologies field
-            tech_str = metadata.get('technologies', '[]')
-            try:
-                if isinstance(tech_str, str):
-                    technologies = json.loads(tech_str)
-                else:
-                    technologies = tech_str
-                    
-                for tech in technologies:
-                    tech_count[tech] += 1
-            except:
-                pass
-        
-        # Sort by count
-        sorted_tech = dict(sorted(tech_count.items(), key=lambda x: x[1], reverse=True)[:10])
-        return sorted_tech
+        return self._accumulate(memories, _TechnologyStats())
     
     def _assess_quality_distribution(self, memories: List[Dict]) -> Dict[str, int]:
         """Assess quality of memories"""
-        quality_dist = {'high': 0, 'medium': 0, 'low': 0}
-        
-        for memory in memories:
-            score = self._calculate_memory_quality_score(memory)
-            
-            if score >= self.quality_thresholds['high']:
-                quality_dist['high'] += 1
-            elif score >= self.quality_thresholds['medium']:
-                quality_dist['medium'] += 1
-            else:
-                quality_dist['low'] += 1
-        
-        return quality_dist
+        return self._accumulate(memories, _QualityStats(self))
     
     def _calculate_memory_quality_score(self, memory: Dict) -> float:
         """Calculate quality score for a memory"""
-        score = 0.0
-        metadata = memory.get('metadata', {})
-        content = memory.get('content', '')
-        
-        # Content length (longer is generally better)
-        if len(content) > 500:
-            score += 0.2
-        elif len(content) > 200:
-            score += 0.1
-        
-        # Has title
-        if metadata.get('title') and metadata.get('title') != 'Untitled':
-            score += 0.2
-        
-        # Has technologies
-        if metadata.get('technologies'):
-            score += 0.15
-        
-        # Has complexity rating
-        if metadata.get('complexity'):
-            score += 0.1
-        
-        # Has date
-        if metadata.get('date') or metadata.get('session_date'):
-            score += 0.1
-        
-        # Has source
-        if metadata.get('source'):
-            score += 0.1
-        
-        # Contains code blocks (valuable for technical memories)
-        if '```' in content:
-            score += 0.15
-        
-        return min(score, 1.0)
+        return memory_quality_score(memory.get('metadata', {}), memory.get('content', ''))
     
     def _find_consolidation_opportunities(self, memories: List[Dict]) -> List[Dict]:
         """Find memories that could be consolidated"""
-        opportunities = []
-        
-        # Group by similar titles or dates
-        title_groups = defaultdict(list)
-        date_groups = defaultdict(list)
-        
-        for memory in memories:
-            metadata = memory.get('metadata', {})
-            
-            # Group by title similarity
-            title = metadata.get('title', '')
-            if title and title != 'Untitled':
-                # Normalize title for grouping
-                title_key = re.sub(r'[^a-z0-9]+', '', title.lower())[:20]
-                title_groups[title_key].append(memory)
-            
-            # Group by date
-            date = metadata.get('date') or metadata.get('session_date')
-            if date:
-                date_groups[date[:10]].append(memory)  # Group by day
-        
-        # Find groups with multiple memories
-        for title_key, group in title_groups.items():
-            if len(group) > 2:
-                opportunities.append({
-                    'type': 'similar_title',
-                    'count': len(group),
-                    'sample': group[0].get('metadata', {}).get('title', 'Unknown'),
-                    'memory_ids': [m['id'] for m in group[:5]]
-                })
-        
-        for date, group in date_groups.items():
-            if len(group) > 3:
-                opportunities.append({
-                    'type': 'same_date',
-                    'date': date,
-                    'count': len(group),
-                    'memory_ids': [m['id'] for m in group[:5]]
-                })
-        
-        return opportunities[:10]  # Return top 10 opportunities
+        return self._accumulate(memories, _ConsolidationStats())
     
     def _get_age_distribution(self, memories: List[Dict]) -> Dict[str, int]:
         """Get age distribution of memories"""
-        age_dist = {
-            'today': 0,
-            'this_week': 0,
-            'this_month': 0,
-            'this_quarter': 0,
-            'older': 0
-        }
-        
-        now = datetime.now()
-        
-        for memory in memories:
-            metadata = memory.get('metadata', {})
-            date_str = metadata.get('date') or metadata.get('session_date')
-            
-            if date_str:
-                try:
-                    memory_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    age_days = (now - memory_date).days
-                    
-                    if age_days == 0:
-                        age_dist['today'] += 1
-                    elif age_days <= 7:
-                        age_dist['this_week'] += 1
-                    elif age_days <= 30:
-                        age_dist['this_month'] += 1
-                    elif age_days <= 90:
-                        age_dist['this_quarter'] += 1
-                    else:
-                        age_dist['older'] += 1
-                except:
-                    pass
-        
-        return age_dist
+        return self._accumulate(memories, _AgeStats())
     
     def _generate_recommendations(self, stats: Dict) -> List[str]:
         """Generate actionable recommendations based on analysis"""
@@ -581,6 +708,46 @@ class MemoryCurator:
             'sample': to_archive[:5]  # Show first 5
         }
     
+    def _enhance_metadata(self, metadata: Dict, content: str) -> Dict:
+        """Return a copy of metadata with missing title, technologies and complexity filled in"""
+        enhanced_metadata = metadata.copy()
+        
+        # Generate better title if missing
+        if not enhanced_metadata.get('title') or enhanced_metadata.get('title') == 'Untitled':
+            # Extract first meaningful line as title
+            lines = content.split('\n')
+            for line in lines:
+                if line.strip() and len(line) > 10 and len(line) < 100:
+                    enhanced_metadata['title'] = line.strip()[:80]
+                    break
+        
+        # Extract technologies from content
+        if not enhanced_metadata.get('technologies'):
+            tech_keywords = ['python', 'javascript', 'typescript', 'react', 'flask', 
+                           'sql', 'html', 'css', 'node', 'npm', 'git', 'docker']
+            found_tech = []
+            content_lower = content.lower()
+            for tech in tech_keywords:
+                if tech in content_lower:
+                    found_tech.append(tech)
+            if found_tech:
+                enhanced_metadata['technologies'] = json.dumps(found_tech)
+        
+        # Add complexity rating based on content
+        if not enhanced_metadata.get('complexity'):
+            if len(content) > 1000 or '```' in content:
+                enhanced_metadata['complexity'] = 'high'
+            elif len(content) > 500:
+                enhanced_metadata['complexity'] = 'medium'
+            else:
+                enhanced_metadata['complexity'] = 'low'
+        
+        # Add enhancement timestamp
+        enhanced_metadata['enhanced_at'] = datetime.now().isoformat()
+        enhanced_metadata['quality_score'] = memory_quality_score(enhanced_metadata, content)
+        
+        return enhanced_metadata
+    
     def enhance_memory_quality(self, memory_id: str) -> Dict[str, Any]:
         """Enhance a low-quality memory with better structure and metadata"""
         try:
@@ -596,40 +763,7 @@ class MemoryCurator:
             content = results['documents'][0] if results['documents'] else ''
             
             # Enhance metadata
-            enhanced_metadata = metadata.copy()
-            
-            # Generate better title if missing
-            if not enhanced_metadata.get('title') or enhanced_metadata.get('title') == 'Untitled':
-                # Extract first meaningful line as title
-                lines = content.split('\n')
-                for line in lines:
-                    if line.strip() and len(line) > 10 and len(line) < 100:
-                        enhanced_metadata['title'] = line.strip()[:80]
-                        break
-            
-            # Extract technologies from content
-            if not enhanced_metadata.get('technologies'):
-                tech_keywords = ['python', 'javascript', 'typescript', 'react', 'flask', 
-                               'sql', 'html', 'css', 'node', 'npm', 'git', 'docker']
-                found_tech = []
-                content_lower = content.lower()
-                for tech in tech_keywords:
-                    if tech in content_lower:
-                        found_tech.append(tech)
-                if found_tech:
-                    enhanced_metadata['technologies'] = json.dumps(found_tech)
-            
-            # Add complexity rating based on content
-            if not enhanced_metadata.get('complexity'):
-                if len(content) > 1000 or '```' in content:
-                    enhanced_metadata['complexity'] = 'high'
-                elif len(content) > 500:
-                    enhanced_metadata['complexity'] = 'medium'
-                else:
-                    enhanced_metadata['complexity'] = 'low'
-            
-            # Add enhancement timestamp
-            enhanced_metadata['enhanced_at'] = datetime.now().isoformat()
+            enhanced_metadata = self._enhance_metadata(metadata, content)
             
             # Update the memory
             self.searcher.collection.update(
@@ -649,4 +783,36 @@ class MemoryCurator:
             
         except Exception as e:
             logger.error(f"Enhancement failed: {e}")
-            return {'success': False, 'error': str(e)}
\ No newline at end of file
+            return {'success': False, 'error': str(e)}
+    
+    def enhance_memories_bulk(self, memory_ids: List[str]) -> int:
+        """Enhance several memories with one get and one update; returns how many were updated
+        
+        Only metadata changes, so the documents (and their embeddings) are left alone.
+        """
+        if not memory_ids:
+            return 0
+        
+        try:
+            results = self.searcher.collection.get(
+                ids=list(memory_ids),
+                include=["metadatas", "documents"]
+            )
+            
+            ids = results['ids']
+            if not ids:
+                return 0
+            
+            metadatas = results['metadatas'] or [{}] * len(ids)
+            documents = results['documents'] or [''] * len(ids)
+            enhanced = [
+                self._enhance_metadata(metadata or {}, content or '')
+                for metadata, content in zip(metadatas, documents)
+            ]
+            
+            self.searcher.collection.update(ids=ids, metadatas=enhanced)
+            return len(ids)
+            
+        except Exception as e:
+            logger.error(f"Bulk enhancement failed: {e}")
+            return 0
@@ -146,6 +146,34 @@ def archive(days, execute):
         except Exception as e:
             console.print(f"[red]Error: {e}[/red]")
 
+@cli.command()
+@click.option('--execute', is_flag=True, help='Actually store the scores (default is dry run)')
+def score_quality(execute):
+    """Store quality scores on memories indexed without one"""
+    dry_run = not execute
+    
+    with console.status(f"[bold green]{'Counting' if dry_run else 'Scoring'} unscored memories..."):
+        try:
+            response = requests.post(f"{API_URL}/api/curator/score-quality",
+                                    json={'dry_run': dry_run})
+            
+            if response.status_code == 200:
+                data = response.json()['data']
+                
+                if dry_run:
+                    console.print(f"[yellow]DRY RUN - No changes made[/yellow]")
+                
+                console.print(f"Found {data['found']} memories without a quality score")
+                
+                if dry_run and data['found'] > 0:
+                    console.print(f"\n[cyan]Run with --execute to score these memories[/cyan]")
+                elif not dry_run and data['scored'] > 0:
+                    console.print(f"[green]✓ Scored {data['scored']} memories[/green]")
+            else:
+                console.print("[red]Quality scoring failed[/red]")
+        except Exception as e:
+            console.print(f"[red]Error: {e}[/red]")
+
 @cli.command()
 @click.argument('memory_ids', nargs=-1, required=True)
 @click.option('--title', help='Title for consolidated memory')
@@ -42,6 +42,11 @@ chmod +x *.sh
 chmod +x test_system.py
 echo "✅ Scripts are now executable"
 
+# Precompile Claude Code hooks (they run with python -B and never write .pyc themselves)
+echo -e "\n⚡ Precompiling hooks..."
+python -m compileall -q .claude/hooks/python-windows/
+echo "✅ Hooks precompiled"
+
 # Initial indexing
 echo -e "\n🔨 Building initial index..."
 python scripts/index_summaries.py
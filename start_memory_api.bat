@@ -43,7 +43,7 @@ if not exist "chroma_db" (
 REM Check if Flask is installed
 echo 🔍 Checking dependencies...
 call venv\Scripts\activate.bat
-python -c "import flask, flask_cors, flask_limiter" 2>nul
+python -c "import flask, flask_cors" 2>nul
 if errorlevel 1 (
     echo ❌ Error: Required dependencies not installed!
     echo.